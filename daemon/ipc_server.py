@@ -9,6 +9,12 @@ from typing import Callable, Awaitable, Optional
 logger = logging.getLogger("vmuxd.ipc")
 SOCKET_PATH = "/tmp/vmuxd.sock"
 
+# The socket stays SOCK_STREAM with newline framing rather than
+# SOCK_SEQPACKET: macOS has no SEQPACKET Unix sockets, every client
+# (vmux CLI, relay server, LiveKit agent, install.sh) speaks the stream
+# protocol, and capture-terminal responses can exceed a single datagram.
+# Each connection carries exactly one request line and one response line.
+
 
 class IpcServer:
     def __init__(self, handler: Callable[[dict], Awaitable[dict]]):
@@ -43,7 +49,7 @@ class IpcServer:
             if not line:
                 return
             try:
-                request = json.loads(line.decode().strip())
+                request = json.loads(line)  # bytes in, no decode/strip copies
             except json.JSONDecodeError:
                 writer.write(json.dumps({"ok": False, "error": "Invalid JSON"}).encode() + b"\n")
                 await writer.drain()
@@ -8,7 +8,7 @@ import time
 import traceback
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 logger = logging.getLogger("vmuxd.services")
 
@@ -92,8 +92,9 @@ class ServiceConfig:
 
 
 class ManagedService:
-    def __init__(self, config: ServiceConfig):
+    def __init__(self, config: ServiceConfig, on_change: Optional[Callable[[], None]] = None):
         self.config = config
+        self._on_change = on_change  # notified when pid changes
         self.process: Optional[asyncio.subprocess.Process] = None
         self.pid: Optional[int] = None
         self.status: str = "stopped"
@@ -133,6 +134,8 @@ class ManagedService:
         self.pid = None
         self.status = "stopped"
         self._close_log()
+        if self._on_change:
+            self._on_change()
 
     def _close_log(self):
         if self._log_fh:
@@ -174,6 +177,8 @@ class ManagedService:
             self.pid = proc.pid
             self.status = "starting"
             logger.info(f"[{self.config.name}] started (pid={self.pid})")
+            if self._on_change:
+                self._on_change()
 
             if self.config.health_url:
                 healthy = await self._wait_healthy(timeout=self.config.startup_grace_s)
@@ -271,11 +276,12 @@ class ManagedService:
 
 
 class ServiceManager:
-    def __init__(self):
+    def __init__(self, on_change: Optional[Callable[[], None]] = None):
         self._services: dict[str, ManagedService] = {}
+        self._on_change = on_change  # notified when any service pid changes
 
     def add(self, config: ServiceConfig):
-        self._services[config.name] = ManagedService(config)
+        self._services[config.name] = ManagedService(config, on_change=self._on_change)
 
     async def start_all(self):
         for svc in self._services.values():
@@ -303,7 +309,6 @@ class ServiceManager:
         return {name: svc.pid for name, svc in self._services.items()}
 
     async def health_check_all(self) -> dict[str, bool]:
-        results = {}
-        for name, svc in self._services.items():
-            results[name] = await svc.health_check()
-        return results
+        names = list(self._services)
+        results = await asyncio.gather(*(self._services[n].health_check() for n in names))
+        return dict(zip(names, results))
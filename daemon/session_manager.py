@@ -10,7 +10,7 @@ import time
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 logger = logging.getLogger("vmuxd.sessions")
 
@@ -141,8 +141,15 @@ class SpawnedSession:
 
 
 class SessionManager:
-    def __init__(self, relay_base_url: str, plugin_dir: str, daemon_secret: str):
+    def __init__(
+        self,
+        relay_base_url: str,
+        plugin_dir: str,
+        daemon_secret: str,
+        on_change: Optional[Callable[[], None]] = None,
+    ):
         self._sessions: dict[str, SpawnedSession] = {}  # daemon_id → session
+        self._on_change = on_change  # notified when the session set changes
         self._relay_url = relay_base_url.rstrip("/")
         self._plugin_dir = plugin_dir
         self._daemon_secret = daemon_secret
@@ -150,6 +157,10 @@ class SessionManager:
         self._health_task: Optional[asyncio.Task] = None
         self._last_reap: float = 0.0
 
+    def _changed(self):
+        if self._on_change:
+            self._on_change()
+
     async def start(self):
         await self.reconcile_orphans()
         self._health_task = asyncio.create_task(self._health_monitor())
@@ -207,6 +218,7 @@ class SessionManager:
             await self._tmux_kill_session(tmux_old)
             async with self._lock:
                 self._sessions.pop(daemon_id_old, None)
+            self._changed()
 
         daemon_id = uuid.uuid4().hex[:8]
         # Use custom name if provided, otherwise fall back to directory basename
@@ -224,6 +236,7 @@ class SessionManager:
 
         async with self._lock:
             self._sessions[daemon_id] = session
+        self._changed()
 
         try:
             # Create tmux session with a login shell so the user's full profile
@@ -281,6 +294,7 @@ class SessionManager:
                 async with self._lock:
                     session.relay_session_id = relay_session_id
                     session.status = "standby"
+                self._changed()
                 logger.info(f"[sessions] {tmux_session} registered as {relay_session_id}")
 
                 # Set custom display name on the relay if provided
@@ -298,6 +312,7 @@ class SessionManager:
                 async with self._lock:
                     session.status = "spawn_failed"
                     self._sessions.pop(daemon_id, None)
+                self._changed()
                 return {"ok": False, "error": "Session did not register within timeout — check vmuxd logs"}
 
         except Exception as e:
@@ -305,6 +320,7 @@ class SessionManager:
             await self._tmux_kill_session(tmux_session)
             async with self._lock:
                 self._sessions.pop(daemon_id, None)
+            self._changed()
             return {"ok": False, "error": str(e)}
 
     async def kill(self, session_id: str) -> bool:
@@ -320,6 +336,7 @@ class SessionManager:
         await self._tmux_kill_session(tmux_session)
         async with self._lock:
             self._sessions.pop(daemon_id, None)
+        self._changed()
         return True
 
     async def interrupt(self, session_id: str) -> bool:
@@ -535,6 +552,7 @@ class SessionManager:
         await self._tmux_kill_session(tmux_session)
         async with self._lock:
             self._sessions.pop(daemon_id, None)
+        self._changed()
         return await self.spawn(cwd)
 
     async def restart_all_sessions(self) -> dict:
@@ -980,6 +998,7 @@ class SessionManager:
             )
             async with self._lock:
                 self._sessions[daemon_id] = session
+            self._changed()
             logger.info(f"[sessions] re-registered orphan: {tmux_session} (relay_session_id={relay_session_id})")
 
             # Best-effort: push this session up to the relay too. The relay's
@@ -1037,6 +1056,7 @@ class SessionManager:
                 logger.warning(f"[sessions] tmux session gone: {session.tmux_session}")
                 async with self._lock:
                     session.status = "dead"
+                self._changed()
                 continue
 
             # Resolve a pending relay_session_id deterministically from cwd
@@ -9,17 +9,22 @@ launchd plist:    ~/Library/LaunchAgents/com.vmux.daemon.plist
 """
 
 import asyncio
+import concurrent.futures
+import functools
 import json
 import logging
+import logging.handlers
 import os
 import resource
 import secrets
 import signal
 import sys
+import threading
 import time
 import traceback
+import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 # Raise file descriptor limit for daemon and all child services.
 # launchd defaults to 256 which is too low for managing multiple services.
@@ -31,6 +36,18 @@ try:
 except (ValueError, OSError):
     pass
 
+# orjson is a declared dependency (pyproject.toml) — daemon.state and the
+# plugin cache's plugin.json files are parsed on startup and every update
+# poll, so use the faster codec.  The json fallback only covers running
+# vmuxd.py straight from a checkout without the venv.  Both parsers accept
+# bytes, which skips the UTF-8 decode pass of Path.read_text().
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
 # Try to set process title for Activity Monitor visibility
 try:
     import setproctitle
@@ -56,6 +73,9 @@ PLUGIN_CACHE_DIR = Path.home() / ".claude" / "plugins" / "cache" / "n33kos" / "v
 
 # Auto-update output log — npm install/build output lands here for debugging.
 UPDATE_LOG = LOG_DIR / "update.log"
+# launchd/systemd stdout.  Kept apart from daemon.log, which the file
+# handler below rotates — the service manager's fd can't follow a rollover.
+DAEMON_STDOUT_LOG = LOG_DIR / "daemon-stdout.log"
 
 # PATH supplement for finding npm/node when launched by launchd (which has a
 # minimal default PATH that excludes Homebrew, asdf, nvm, etc.).
@@ -71,6 +91,10 @@ _NPM_PATH_CANDIDATES = [
 
 RELAY_URL = "http://127.0.0.1:3100"
 AUTO_UPDATE_INTERVAL = 60  # seconds between version checks
+AUTO_UPDATE_FULL_SCAN_EVERY = 10  # polls between forced scans, signature unchanged or not
+STATE_HEARTBEAT_INTERVAL = 60  # max seconds between daemon.state writes
+NPM_STEP_TIMEOUT = 300  # seconds per npm ci / npm run build during an update
+IO_POOL_SHUTDOWN_TIMEOUT = 10.0  # seconds _shutdown waits for in-flight pool jobs
 
 # Kokoro memory watchdog settings
 KOKORO_MAX_RSS_MB = int(os.environ.get("KOKORO_MAX_RSS_MB", "5120"))
@@ -78,15 +102,22 @@ KOKORO_WATCHDOG_INTERVAL = 30  # seconds between RSS checks
 KOKORO_WATCHDOG_COOLDOWN = 300  # minimum seconds between memory-triggered restarts
 
 
-# Configure logging before imports
+# Configure logging before imports.  The file handler is size-bounded and
+# opened lazily.  Under launchd/systemd stdout is redirected to
+# DAEMON_STDOUT_LOG (child output, uncaught tracebacks), so the stdout
+# handler is only attached for interactive runs.
 LOG_DIR.mkdir(parents=True, exist_ok=True)
+_log_handlers: list[logging.Handler] = [
+    logging.handlers.RotatingFileHandler(
+        LOG_DIR / "daemon.log", maxBytes=10_000_000, backupCount=3, delay=True,
+    ),
+]
+if sys.stdout.isatty():
+    _log_handlers.append(logging.StreamHandler(sys.stdout))
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(name)s] %(levelname)s %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_DIR / "daemon.log"),
-        logging.StreamHandler(sys.stdout),
-    ],
+    handlers=_log_handlers,
 )
 logger = logging.getLogger("vmuxd")
 
@@ -141,15 +172,72 @@ def _load_or_create_daemon_secret() -> str:
     return secret
 
 
+# pid → start time, so each state write doesn't re-query a live service.
+_start_time_cache: dict[int, str] = {}
+
+
+def _process_start_time(pid: int) -> Optional[str]:
+    """Opaque start-time token for pid, or None if it can't be determined.
+
+    Two processes with the same PID have different start times, which is
+    what lets _cleanup_stale_processes detect PID reuse.  Linux reads
+    /proc/<pid>/stat (field 22, clock ticks since boot); elsewhere falls
+    back to `ps -o lstart=`, pinned to the C locale and UTC so the token
+    doesn't change when the user's locale or timezone does.
+    """
+    import subprocess
+    try:
+        if sys.platform.startswith("linux"):
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                stat = f.read()
+            # comm (field 2) may contain spaces — split after its closing paren
+            return stat.rsplit(b")", 1)[1].split()[19].decode()
+        r = subprocess.run(
+            ["ps", "-o", "lstart=", "-p", str(pid)],
+            capture_output=True, text=True, timeout=2,
+            env={**os.environ, "LC_ALL": "C", "TZ": "UTC"},
+        )
+        out = r.stdout.strip()
+        return out if r.returncode == 0 and out else None
+    except (OSError, IndexError, subprocess.SubprocessError):
+        return None
+
+
 def _write_state(service_pids: dict, session_data: list):
     """Write daemon.state — lets external tools find and kill all managed processes."""
+    live = {pid for pid in service_pids.values() if pid is not None}
+    for pid in list(_start_time_cache):
+        if pid not in live:
+            del _start_time_cache[pid]
+    start_times = {}
+    for name, pid in service_pids.items():
+        if pid is None:
+            continue
+        if pid not in _start_time_cache:
+            started = _process_start_time(pid)
+            if started is None:
+                continue
+            _start_time_cache[pid] = started
+        start_times[name] = _start_time_cache[pid]
     state = {
         "daemon_pid": os.getpid(),
         "updated_at": time.time(),
         "service_pids": service_pids,
+        # Lets the next daemon skip PIDs the OS has since handed to
+        # unrelated processes.
+        "service_start_times": start_times,
         "sessions": session_data,
     }
-    DAEMON_STATE_FILE.write_text(json.dumps(state, indent=2))
+    # Compact encoding — nothing edits this file by hand.
+    if orjson is not None:
+        payload = orjson.dumps(state)
+    else:
+        payload = json.dumps(state, separators=(",", ":")).encode()
+    # Write to a sibling and rename into place so a crash mid-write can't
+    # leave a truncated file that makes the next startup skip orphan cleanup.
+    tmp_path = DAEMON_STATE_FILE.with_suffix(".state.tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, DAEMON_STATE_FILE)
 
 
 def _cleanup_stale_processes():
@@ -164,8 +252,8 @@ def _cleanup_stale_processes():
         return
 
     try:
-        state = json.loads(DAEMON_STATE_FILE.read_text())
-    except (json.JSONDecodeError, OSError):
+        state = _json_loads(DAEMON_STATE_FILE.read_bytes())
+    except (json.JSONDecodeError, OSError):  # orjson.JSONDecodeError subclasses it
         return
 
     old_daemon_pid = state.get("daemon_pid")
@@ -185,33 +273,51 @@ def _cleanup_stale_processes():
     if not service_pids:
         return
 
+    # Skip PIDs that have been reused since the state was written — the
+    # recorded start time no longer matches.  Older state files carry no
+    # start times; those PIDs are trusted as before.
+    start_times = state.get("service_start_times", {})
+    for name, pid in list(service_pids.items()):
+        recorded = start_times.get(name)
+        if pid is None or recorded is None:
+            continue
+        if _process_start_time(pid) != recorded:
+            logger.info(f"[startup] {name} pid={pid} no longer ours (exited or reused) — skipping")
+            service_pids[name] = None
+
     killed = []
     for name, pid in service_pids.items():
         if pid is None:
             continue
         # Try process group kill first (handles start_new_session children)
+        pgid_ok = False
         try:
             pgid = os.getpgid(pid)
             os.killpg(pgid, signal.SIGTERM)
             killed.append(f"{name}(pgid={pgid})")
+            pgid_ok = True
         except (ProcessLookupError, OSError):
             pass
         # Fallback: kill the individual PID
         try:
             os.kill(pid, signal.SIGTERM)
-            if f"{name}(pgid=" not in str(killed):
+            if not pgid_ok:
                 killed.append(f"{name}(pid={pid})")
         except (ProcessLookupError, OSError):
             pass
 
     if killed:
         logger.info(f"[startup] cleaned up stale processes: {', '.join(killed)}")
-        # Give processes a moment to exit, then SIGKILL stragglers
-        import time as _time
-        _time.sleep(1)
-        for name, pid in service_pids.items():
-            if pid is None:
-                continue
+        # Poll for exit (up to 1s) instead of sleeping the full second, then
+        # SIGKILL only the stragglers.
+        survivors = [(name, pid) for name, pid in service_pids.items() if pid is not None]
+        deadline = time.monotonic() + 1.0
+        while True:
+            survivors = [(name, pid) for name, pid in survivors if _pid_alive(pid)]
+            if not survivors or time.monotonic() >= deadline:
+                break
+            time.sleep(0.02)
+        for name, pid in survivors:
             try:
                 pgid = os.getpgid(pid)
                 os.killpg(pgid, signal.SIGKILL)
@@ -223,7 +329,64 @@ def _cleanup_stale_processes():
                 pass
 
 
-def _build_service_configs():
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)  # probe, don't actually signal
+        return True
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists but owned by someone else (EPERM)
+
+
+def _force_exit_after_timeout() -> None:
+    logger.warning("[update] graceful shutdown timed out — forcing exit")
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def _pre_startup() -> str:
+    """Blocking startup prep, run off the event loop.  Returns the daemon secret.
+
+    Stale processes from a previous daemon crash are killed here, before any
+    service binds its port.
+    """
+    _load_env()
+    secret = _load_or_create_daemon_secret()
+    _cleanup_stale_processes()
+    return secret
+
+
+# Static command templates — only ports and paths vary per start, so the
+# long argument lists are built once at import rather than on every call.
+_KOKORO_CMD_PREFIX = (
+    "uv", "run",
+    "--no-sync",  # use the existing venv created by install.sh
+    "uvicorn", "api.src.main:app",
+    "--host", "127.0.0.1",
+)
+_RELAY_CMD = (
+    "uv", "run",
+    "--python", "3.12",
+    "--with", "fastapi>=0.110",
+    "--with", "uvicorn>=0.27",
+    "--with", "uvloop>=0.19",
+    "--with", "orjson>=3.9",
+    "--with", "websockets>=12.0",
+    "--with", "httpx>=0.27",
+    "--with", "python-dotenv>=1.0",
+    "--with", "livekit-api>=0.7",
+    "--with", "livekit>=1.0",
+    "--with", "numpy>=1.24",
+    "--with", "scipy>=1.10",
+    "--with", "webrtcvad-wheels>=2.0.10",
+    "--with", "fastmcp>=2.0",
+    "--with", "PyJWT>=2.8",
+    "--with", "setproctitle>=1.3",
+    "server.py",
+)
+
+
+def _build_service_configs(daemon_secret: str):
     """Build ServiceConfig objects from environment variables."""
     from service_manager import ServiceConfig
 
@@ -244,11 +407,7 @@ def _build_service_configs():
 
     # Resolve thread count
     if whisper_threads == "auto":
-        import os as _os
-        try:
-            whisper_threads = str(_os.cpu_count() or 4)
-        except Exception:
-            whisper_threads = "4"
+        whisper_threads = str(os.cpu_count() or 4)
 
     # Resolve relay-server path. Priority order:
     # 1. DATA_DIR/relay-server — managed copy updated by auto-updates
@@ -286,13 +445,7 @@ def _build_service_configs():
         ),
         ServiceConfig(
             name="kokoro",
-            cmd=[
-                "uv", "run",
-                "--no-sync",  # use the existing venv created by install.sh
-                "uvicorn", "api.src.main:app",
-                "--host", "127.0.0.1",
-                "--port", str(kokoro_port),
-            ],
+            cmd=[*_KOKORO_CMD_PREFIX, "--port", str(kokoro_port)],
             env={
                 "USE_GPU": "true",
                 "USE_ONNX": "false",
@@ -324,34 +477,17 @@ def _build_service_configs():
         ),
         ServiceConfig(
             name="relay",
-            cmd=[
-                "uv", "run",
-                "--python", "3.12",
-                "--with", "fastapi>=0.110",
-                "--with", "uvicorn>=0.27",
-                "--with", "websockets>=12.0",
-                "--with", "httpx>=0.27",
-                "--with", "python-dotenv>=1.0",
-                "--with", "livekit-api>=0.7",
-                "--with", "livekit>=1.0",
-                "--with", "numpy>=1.24",
-                "--with", "scipy>=1.10",
-                "--with", "webrtcvad-wheels>=2.0.10",
-                "--with", "fastmcp>=2.0",
-                "--with", "PyJWT>=2.8",
-                "--with", "setproctitle>=1.3",
-                "server.py",
-            ],
+            cmd=list(_RELAY_CMD),
             env={
                 "WHISPER_URL": f"http://127.0.0.1:{whisper_port}/v1",
                 "KOKORO_URL": f"http://127.0.0.1:{kokoro_port}/v1",
-                "VMUX_DAEMON_SECRET": _load_or_create_daemon_secret(),
+                "VMUX_DAEMON_SECRET": daemon_secret,
                 # Point relay server to the managed web dist so auto-updates take effect.
                 "VMUX_WEB_DIST": str(DATA_DIR / "web" / "dist"),
             },
             cwd=str(relay_server_dir),
             health_url=f"http://127.0.0.1:{relay_port}/api/health",
-            health_headers={"X-Daemon-Secret": _load_or_create_daemon_secret()},
+            health_headers={"X-Daemon-Secret": daemon_secret},
             log_dir=log_dir,
             startup_grace_s=30.0,
         ),
@@ -366,27 +502,72 @@ class VmuxDaemon:
         self._ipc_server = None
         self._daemon_secret: str = ""
         self._shutdown_event: Optional[asyncio.Event] = None  # created in run() on the correct loop
+        self._state_dirty: Optional[asyncio.Event] = None  # set when daemon.state needs rewriting
         self._update_task: Optional[asyncio.Task] = None
         self._state_task: Optional[asyncio.Task] = None
         self._watchdog_task: Optional[asyncio.Task] = None
         self._last_kokoro_memory_restart: float = 0.0  # monotonic timestamp
+        self._last_cache_sig: Optional[tuple] = None  # _plugin_cache_signature() at last good check
+        # Set for the whole check → stage → swap → restart sequence so the
+        # auto-update loop and an IPC update-if-newer never swap trees
+        # concurrently.  Left set once a restart is scheduled.
+        self._update_running: bool = False
+        self._npm_proc: Optional[asyncio.subprocess.Process] = None  # update's running npm step
+        # IPC dispatch table — one dict lookup per request instead of an
+        # if/elif ladder over every command name.
+        self._ipc_handlers: dict[str, Callable[[dict], Awaitable[dict]]] = {
+            "status": self._ipc_status,
+            "spawn": self._ipc_spawn,
+            "kill": self._ipc_kill,
+            "list": self._ipc_list,
+            "interrupt": self._ipc_interrupt,
+            "hard-interrupt": self._ipc_hard_interrupt,
+            "clear-context": self._ipc_clear_context,
+            "compact": self._ipc_compact,
+            "change-model": self._ipc_change_model,
+            "change-effort": self._ipc_change_effort,
+            "context-usage": self._ipc_context_usage,
+            "restart-session": self._ipc_restart_session,
+            "restart-all-sessions": self._ipc_restart_all_sessions,
+            "reconnect-session": self._ipc_reconnect_session,
+            "restart": self._ipc_restart,
+            "attach-info": self._ipc_attach_info,
+            "capture-terminal": self._ipc_capture_terminal,
+            "capture-terminal-ansi": self._ipc_capture_terminal_ansi,
+            "send-keys": self._ipc_send_keys,
+            "inject-text": self._ipc_inject_text,
+            "resize-pane": self._ipc_resize_pane,
+            "send-message": self._ipc_send_message,
+            "auth-code": self._ipc_auth_code,
+            "update-if-newer": self._ipc_update_if_newer,
+            "shutdown": self._ipc_shutdown,
+        }
+        # Dedicated pool for blocking work (npm builds, state writes) so slow
+        # one-shot jobs never starve the default executor used by libraries.
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="vmuxd-io",
+        )
 
     async def run(self):
         # Create Event inside the coroutine so it binds to asyncio.run()'s loop.
         # Creating it in __init__ causes "Future attached to a different loop" on Python 3.9.
         self._shutdown_event = asyncio.Event()
+        self._state_dirty = asyncio.Event()
         logger.info(f"vmuxd starting (pid={os.getpid()})")
-        _load_env()
-        self._daemon_secret = _load_or_create_daemon_secret()
+        # Blocking filesystem prep (env, secret, stale-process cleanup) runs on
+        # the I/O pool while the imports below happen on the loop thread.
+        prep = asyncio.get_running_loop().run_in_executor(self._io_pool, _pre_startup)
 
         # Import here after sys.path is set up
         from service_manager import ServiceManager
         from session_manager import SessionManager
         from ipc_server import IpcServer
 
+        self._daemon_secret = await prep
+
         # Build and start service manager
-        self._service_manager = ServiceManager()
-        for cfg in _build_service_configs():
+        self._service_manager = ServiceManager(on_change=self._state_dirty.set)
+        for cfg in _build_service_configs(self._daemon_secret):
             self._service_manager.add(cfg)
 
         plugin_dir = os.environ.get("VMUX_PLUGIN_DIR", str(DAEMON_DIR.parent.parent))
@@ -394,13 +575,11 @@ class VmuxDaemon:
             relay_base_url=RELAY_URL,
             plugin_dir=plugin_dir,
             daemon_secret=self._daemon_secret,
+            on_change=self._state_dirty.set,
         )
 
         self._ipc_server = IpcServer(self._handle_ipc)
 
-        # Kill orphaned processes from a previous daemon crash before binding ports
-        _cleanup_stale_processes()
-
         # Start all components
         logger.info("Starting infrastructure services...")
         await self._service_manager.start_all()
@@ -419,8 +598,13 @@ class VmuxDaemon:
 
         # Set up signal handlers
         loop = asyncio.get_running_loop()
-        for sig in (signal.SIGTERM, signal.SIGINT):
-            loop.add_signal_handler(sig, lambda: self._shutdown_event.set())
+        # SIGHUP (terminal hangup) gets the same clean shutdown as TERM/INT so
+        # child services are stopped instead of orphaned.  SIGUSR1 forces an
+        # immediate daemon.state flush.
+        shutdown = self._shutdown_event.set
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            loop.add_signal_handler(sig, shutdown)
+        loop.add_signal_handler(signal.SIGUSR1, self._state_dirty.set)
 
         logger.info("vmuxd ready — listening on /tmp/vmuxd.sock")
         await self._shutdown_event.wait()
@@ -429,6 +613,11 @@ class VmuxDaemon:
     async def _shutdown(self):
         logger.info("vmuxd shutting down...")
 
+        # Kill an in-flight update's npm first — otherwise the update's
+        # TemporaryDirectory is torn down under a still-running build.
+        if self._npm_proc is not None:
+            _kill_process_group(self._npm_proc)
+
         for task in (self._update_task, self._state_task, self._watchdog_task):
             if task and not task.done():
                 task.cancel()
@@ -446,147 +635,34 @@ class VmuxDaemon:
         if self._service_manager:
             await self._service_manager.stop_all(timeout=8.0)
 
+        # Wait for in-flight pool jobs — a _write_state already running
+        # would otherwise os.replace daemon.state back after the unlink
+        # below, leaving dead PIDs for the next start to act on.  Waited on
+        # off the loop and bounded, so a long tree copy can't stall signal
+        # handling for its whole duration.
+        try:
+            await asyncio.wait_for(
+                asyncio.to_thread(functools.partial(
+                    self._io_pool.shutdown, wait=True, cancel_futures=True,
+                )),
+                timeout=IO_POOL_SHUTDOWN_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"I/O pool still busy after {IO_POOL_SHUTDOWN_TIMEOUT:.0f}s; "
+                f"removing daemon.state anyway"
+            )
+
         DAEMON_STATE_FILE.unlink(missing_ok=True)
         logger.info("vmuxd stopped.")
 
     async def _handle_ipc(self, request: dict) -> dict:
         cmd = request.get("cmd", "")
+        handler = self._ipc_handlers.get(cmd) if isinstance(cmd, str) else None
+        if handler is None:
+            return {"ok": False, "error": f"Unknown command: {cmd}"}
         try:
-            if cmd == "status":
-                return await self._cmd_status()
-            elif cmd == "spawn":
-                cwd = request.get("cwd", "")
-                session_name = request.get("session_name", "")
-                if not cwd and not session_name:
-                    return {"ok": False, "error": "cwd or session_name is required"}
-                return await self._session_manager.spawn(cwd, session_name=session_name)
-            elif cmd == "kill":
-                session_id = request.get("session_id", "")
-                if not session_id:
-                    return {"ok": False, "error": "session_id is required"}
-                ok = await self._session_manager.kill(session_id)
-                return {"ok": ok, "error": None if ok else "Session not found"}
-            elif cmd == "list":
-                sessions = await self._session_manager.list_sessions()
-                return {"ok": True, "sessions": sessions}
-            elif cmd == "interrupt":
-                session_id = request.get("session_id", "")
-                ok = await self._session_manager.interrupt(session_id)
-                return {"ok": ok}
-            elif cmd == "hard-interrupt":
-                session_id = request.get("session_id", "")
-                ok = await self._session_manager.hard_interrupt(session_id)
-                return {"ok": ok}
-            elif cmd == "clear-context":
-                session_id = request.get("session_id", "")
-                ok = await self._session_manager.clear_context(session_id)
-                return {"ok": ok}
-            elif cmd == "compact":
-                session_id = request.get("session_id", "")
-                ok = await self._session_manager.compact_context(session_id)
-                return {"ok": ok}
-            elif cmd == "change-model":
-                session_id = request.get("session_id", "")
-                model = request.get("model", "")
-                if not model:
-                    return {"ok": False, "error": "model is required"}
-                ok = await self._session_manager.change_model(session_id, model)
-                return {"ok": ok}
-            elif cmd == "change-effort":
-                session_id = request.get("session_id", "")
-                level = request.get("level", "")
-                if level not in ("low", "medium", "high", "max", "xhigh"):
-                    return {"ok": False, "error": "invalid effort level"}
-                ok = await self._session_manager.change_effort(session_id, level)
-                return {"ok": ok}
-            elif cmd == "context-usage":
-                session_id = request.get("session_id", "")
-                usage = await self._session_manager.get_context_usage(session_id)
-                if usage:
-                    return {"ok": True, **usage}
-                return {"ok": False, "error": "Context usage not available"}
-            elif cmd == "restart-session":
-                session_id = request.get("session_id", "")
-                return await self._session_manager.restart_session(session_id)
-            elif cmd == "restart-all-sessions":
-                return await self._session_manager.restart_all_sessions()
-            elif cmd == "reconnect-session":
-                session_id = request.get("session_id", "")
-                cwd = request.get("cwd", "")
-                return await self._session_manager.reconnect_session(session_id=session_id, cwd=cwd)
-            elif cmd == "restart":
-                service = request.get("service", "")
-                ok = await self._service_manager.restart(service)
-                return {"ok": ok, "error": None if ok else f"Service not found: {service}"}
-            elif cmd == "attach-info":
-                session_id = request.get("session_id", "")
-                info = await self._session_manager.get_attach_info(session_id)
-                if info:
-                    return {"ok": True, **info}
-                return {"ok": False, "error": "Session not found"}
-            elif cmd == "capture-terminal":
-                session_id = request.get("session_id", "")
-                lines = int(request.get("lines", 50))
-                output = await self._session_manager.capture_terminal(session_id, lines)
-                if output is None:
-                    return {"ok": False, "error": "Session not found or tmux capture failed"}
-                return {"ok": True, "output": output}
-            elif cmd == "capture-terminal-ansi":
-                session_id = request.get("session_id", "")
-                lines = int(request.get("lines", 50))
-                content = await self._session_manager.capture_terminal_ansi(
-                    session_id, int(lines)
-                )
-                return {"ok": True, "content": content}
-            elif cmd == "send-keys":
-                session_id = request.get("session_id", "")
-                keys = request.get("keys", "")
-                special = request.get("special_key", "")
-                if not session_id:
-                    return {"ok": False, "error": "session_id is required"}
-                if special:
-                    ok = await self._session_manager.send_special_key(session_id, special)
-                elif keys:
-                    ok = await self._session_manager.send_keys(session_id, keys)
-                else:
-                    return {"ok": False, "error": "keys or special_key is required"}
-                return {"ok": ok, "error": None if ok else "Session not found or send failed"}
-            elif cmd == "inject-text":
-                session_id = request.get("session_id", "")
-                text = request.get("text", "")
-                if not session_id:
-                    return {"ok": False, "error": "session_id is required"}
-                if not text:
-                    return {"ok": False, "error": "text is required"}
-                ok = await self._session_manager.inject_text(session_id, text)
-                return {"ok": ok, "error": None if ok else "Session not found or inject failed"}
-            elif cmd == "resize-pane":
-                session_id = request.get("session_id", "")
-                cols = int(request.get("cols") or 0)
-                rows = int(request.get("rows") or 0)
-                if not session_id:
-                    return {"ok": False, "error": "session_id is required"}
-                if cols <= 0 or rows <= 0:
-                    return {"ok": False, "error": "cols and rows must be positive"}
-                ok = await self._session_manager.resize_pane(session_id, cols, rows)
-                return {"ok": ok, "error": None if ok else "Session not found or resize failed"}
-            elif cmd == "send-message":
-                session_id = request.get("session_id", "")
-                text = request.get("text", "")
-                if not session_id:
-                    return {"ok": False, "error": "session_id is required"}
-                if not text:
-                    return {"ok": False, "error": "text is required"}
-                return await self._cmd_send_message(session_id, text)
-            elif cmd == "auth-code":
-                return await self._cmd_auth_code()
-            elif cmd == "update-if-newer":
-                return await self._cmd_update_if_newer()
-            elif cmd == "shutdown":
-                self._shutdown_event.set()
-                return {"ok": True}
-            else:
-                return {"ok": False, "error": f"Unknown command: {cmd}"}
+            return await handler(request)
         except Exception as e:
             # Bare str(e) on FileNotFoundError drops the filename, which has
             # cost real debugging time. Include type + filename + traceback
@@ -596,14 +672,168 @@ class VmuxDaemon:
             logger.error(f"IPC handler traceback for cmd={cmd}:\n{traceback.format_exc()}")
             return {"ok": False, "error": detail}
 
+    # --- IPC command handlers (cmd → method table built in __init__) ---
+
+    async def _ipc_status(self, request: dict) -> dict:
+        return await self._cmd_status()
+
+    async def _ipc_spawn(self, request: dict) -> dict:
+        cwd = request.get("cwd", "")
+        session_name = request.get("session_name", "")
+        if not cwd and not session_name:
+            return {"ok": False, "error": "cwd or session_name is required"}
+        return await self._session_manager.spawn(cwd, session_name=session_name)
+
+    async def _ipc_kill(self, request: dict) -> dict:
+        session_id = request.get("session_id", "")
+        if not session_id:
+            return {"ok": False, "error": "session_id is required"}
+        ok = await self._session_manager.kill(session_id)
+        return {"ok": ok, "error": None if ok else "Session not found"}
+
+    async def _ipc_list(self, request: dict) -> dict:
+        sessions = await self._session_manager.list_sessions()
+        return {"ok": True, "sessions": sessions}
+
+    async def _ipc_interrupt(self, request: dict) -> dict:
+        ok = await self._session_manager.interrupt(request.get("session_id", ""))
+        return {"ok": ok}
+
+    async def _ipc_hard_interrupt(self, request: dict) -> dict:
+        ok = await self._session_manager.hard_interrupt(request.get("session_id", ""))
+        return {"ok": ok}
+
+    async def _ipc_clear_context(self, request: dict) -> dict:
+        ok = await self._session_manager.clear_context(request.get("session_id", ""))
+        return {"ok": ok}
+
+    async def _ipc_compact(self, request: dict) -> dict:
+        ok = await self._session_manager.compact_context(request.get("session_id", ""))
+        return {"ok": ok}
+
+    async def _ipc_change_model(self, request: dict) -> dict:
+        session_id = request.get("session_id", "")
+        model = request.get("model", "")
+        if not model:
+            return {"ok": False, "error": "model is required"}
+        ok = await self._session_manager.change_model(session_id, model)
+        return {"ok": ok}
+
+    async def _ipc_change_effort(self, request: dict) -> dict:
+        session_id = request.get("session_id", "")
+        level = request.get("level", "")
+        if level not in ("low", "medium", "high", "max", "xhigh"):
+            return {"ok": False, "error": "invalid effort level"}
+        ok = await self._session_manager.change_effort(session_id, level)
+        return {"ok": ok}
+
+    async def _ipc_context_usage(self, request: dict) -> dict:
+        usage = await self._session_manager.get_context_usage(request.get("session_id", ""))
+        if usage:
+            return {"ok": True, **usage}
+        return {"ok": False, "error": "Context usage not available"}
+
+    async def _ipc_restart_session(self, request: dict) -> dict:
+        return await self._session_manager.restart_session(request.get("session_id", ""))
+
+    async def _ipc_restart_all_sessions(self, request: dict) -> dict:
+        return await self._session_manager.restart_all_sessions()
+
+    async def _ipc_reconnect_session(self, request: dict) -> dict:
+        session_id = request.get("session_id", "")
+        cwd = request.get("cwd", "")
+        return await self._session_manager.reconnect_session(session_id=session_id, cwd=cwd)
+
+    async def _ipc_restart(self, request: dict) -> dict:
+        service = request.get("service", "")
+        ok = await self._service_manager.restart(service)
+        return {"ok": ok, "error": None if ok else f"Service not found: {service}"}
+
+    async def _ipc_attach_info(self, request: dict) -> dict:
+        info = await self._session_manager.get_attach_info(request.get("session_id", ""))
+        if info:
+            return {"ok": True, **info}
+        return {"ok": False, "error": "Session not found"}
+
+    async def _ipc_capture_terminal(self, request: dict) -> dict:
+        session_id = request.get("session_id", "")
+        lines = int(request.get("lines", 50))
+        output = await self._session_manager.capture_terminal(session_id, lines)
+        if output is None:
+            return {"ok": False, "error": "Session not found or tmux capture failed"}
+        return {"ok": True, "output": output}
+
+    async def _ipc_capture_terminal_ansi(self, request: dict) -> dict:
+        session_id = request.get("session_id", "")
+        lines = int(request.get("lines", 50))
+        content = await self._session_manager.capture_terminal_ansi(session_id, lines)
+        return {"ok": True, "content": content}
+
+    async def _ipc_send_keys(self, request: dict) -> dict:
+        session_id = request.get("session_id", "")
+        keys = request.get("keys", "")
+        special = request.get("special_key", "")
+        if not session_id:
+            return {"ok": False, "error": "session_id is required"}
+        if special:
+            ok = await self._session_manager.send_special_key(session_id, special)
+        elif keys:
+            ok = await self._session_manager.send_keys(session_id, keys)
+        else:
+            return {"ok": False, "error": "keys or special_key is required"}
+        return {"ok": ok, "error": None if ok else "Session not found or send failed"}
+
+    async def _ipc_inject_text(self, request: dict) -> dict:
+        session_id = request.get("session_id", "")
+        text = request.get("text", "")
+        if not session_id:
+            return {"ok": False, "error": "session_id is required"}
+        if not text:
+            return {"ok": False, "error": "text is required"}
+        ok = await self._session_manager.inject_text(session_id, text)
+        return {"ok": ok, "error": None if ok else "Session not found or inject failed"}
+
+    async def _ipc_resize_pane(self, request: dict) -> dict:
+        session_id = request.get("session_id", "")
+        cols = int(request.get("cols") or 0)
+        rows = int(request.get("rows") or 0)
+        if not session_id:
+            return {"ok": False, "error": "session_id is required"}
+        if cols <= 0 or rows <= 0:
+            return {"ok": False, "error": "cols and rows must be positive"}
+        ok = await self._session_manager.resize_pane(session_id, cols, rows)
+        return {"ok": ok, "error": None if ok else "Session not found or resize failed"}
+
+    async def _ipc_send_message(self, request: dict) -> dict:
+        session_id = request.get("session_id", "")
+        text = request.get("text", "")
+        if not session_id:
+            return {"ok": False, "error": "session_id is required"}
+        if not text:
+            return {"ok": False, "error": "text is required"}
+        return await self._cmd_send_message(session_id, text)
+
+    async def _ipc_auth_code(self, request: dict) -> dict:
+        return await self._cmd_auth_code()
+
+    async def _ipc_update_if_newer(self, request: dict) -> dict:
+        return await self._cmd_update_if_newer()
+
+    async def _ipc_shutdown(self, request: dict) -> dict:
+        self._shutdown_event.set()
+        return {"ok": True}
+
     async def _cmd_status(self) -> dict:
         services = self._service_manager.get_status()
-        # Run live health checks to catch silently-broken services
-        health = await self._service_manager.health_check_all()
+        # Run live health checks (to catch silently-broken services) and the
+        # session listing concurrently — latency is max() of the two, not sum.
+        health, sessions = await asyncio.gather(
+            self._service_manager.health_check_all(),
+            self._session_manager.list_sessions(),
+        )
         for name in services:
             if services[name] == "running" and not health.get(name, True):
                 services[name] = "unhealthy"
-        sessions = await self._session_manager.list_sessions()
         return {
             "ok": True,
             "daemon_pid": os.getpid(),
@@ -659,15 +889,57 @@ class VmuxDaemon:
         leave the daemon running stale in-memory code while files on disk are
         swapped — silent and easy to miss.
         """
+        loop = asyncio.get_running_loop()
+        polls = 0
         while True:
             try:
                 await asyncio.sleep(AUTO_UPDATE_INTERVAL)
-                await self._cmd_update_if_newer()
+                polls += 1
+                # Skip the full check (N plugin.json parses + version
+                # compares) while no cache dir, version dir or plugin.json
+                # mtime has moved.  Every AUTO_UPDATE_FULL_SCAN_EVERY polls
+                # check regardless, for changes mtimes don't surface (deeper
+                # nesting, coarse-mtime filesystems).  The signature is only
+                # recorded after a successful check so failed updates retry.
+                sig = await loop.run_in_executor(self._io_pool, _plugin_cache_signature)
+                if (
+                    sig is not None
+                    and sig == self._last_cache_sig
+                    and polls % AUTO_UPDATE_FULL_SCAN_EVERY
+                ):
+                    continue
+                result = await self._cmd_update_if_newer()
+                if result.get("ok"):
+                    self._last_cache_sig = sig
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.warning(f"[update] check failed: {e}")
 
+    async def _run_npm(self, argv: list[str], cwd: Path, env: dict, logf) -> int:
+        """Run one npm step as a killable subprocess and return its exit code.
+
+        Runs in its own process group (npm forks node workers) and is
+        tracked in _npm_proc so _shutdown can kill it.  Raises
+        asyncio.TimeoutError after NPM_STEP_TIMEOUT, with the group killed.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            cwd=str(cwd),
+            env=env,
+            stdout=logf,
+            stderr=asyncio.subprocess.STDOUT,
+            start_new_session=True,
+        )
+        self._npm_proc = proc
+        try:
+            return await asyncio.wait_for(proc.wait(), timeout=NPM_STEP_TIMEOUT)
+        finally:
+            if proc.returncode is None:
+                _kill_process_group(proc)
+                await proc.wait()
+            self._npm_proc = None
+
     async def _restart_after_update(self):
         """Trigger a clean daemon restart after a successful update.
 
@@ -682,19 +954,39 @@ class VmuxDaemon:
              child process groups (start_new_session=True spawn means children
              survive a parent crash; the explicit kill_pg in stop_all is the
              only thing that takes them down).
-          3. After 15s, if graceful shutdown stalled, force-exit so launchd
-             respawns vmuxd from disk (fresh imports, fresh session_manager,
-             fresh service_manager → fresh relay/kokoro/whisper).
+          3. After 15s, if graceful shutdown stalled, SIGKILL ourselves so
+             launchd respawns vmuxd from disk (fresh imports, fresh
+             session_manager, fresh service_manager → fresh
+             relay/kokoro/whisper).  The deadline runs on a daemon thread,
+             not the event loop, so it still fires if a wedged handler is
+             blocking the loop; if shutdown finishes first the process exits
+             and the thread dies with it.
         """
         await asyncio.sleep(1.0)
         logger.info("[update] update applied — triggering full restart via launchd")
+        watchdog = threading.Timer(15.0, _force_exit_after_timeout)
+        watchdog.daemon = True
+        watchdog.start()
         if self._shutdown_event:
             self._shutdown_event.set()
-        await asyncio.sleep(15)
-        logger.warning("[update] graceful shutdown timed out — forcing exit")
-        os._exit(0)
 
     async def _cmd_update_if_newer(self) -> dict:
+        """Run _apply_update unless another update is already in flight."""
+        if self._update_running:
+            logger.info("[update] update already running — skipping")
+            return {"ok": False, "error": "update already running"}
+        self._update_running = True
+        result: dict = {}
+        try:
+            result = await self._apply_update()
+            return result
+        finally:
+            # A successful update has scheduled a restart — keep later
+            # checks out until the process goes down.
+            if not result.get("updated"):
+                self._update_running = False
+
+    async def _apply_update(self) -> dict:
         """Check plugin cache for a newer plugin and apply it.
 
         Plugin version (.claude-plugin/plugin.json) and daemon version
@@ -712,6 +1004,7 @@ class VmuxDaemon:
              bounces the child services so they pick up new relay/UI
              assets without taking the daemon down.
         """
+        loop = asyncio.get_running_loop()
         installed_plugin_version = _read_installed_plugin_version()
         running_daemon_version = _read_installed_version()
         logger.info(
@@ -723,25 +1016,21 @@ class VmuxDaemon:
             logger.info(f"[update] plugin cache dir not found")
             return {"ok": True, "updated": False, "reason": "plugin cache not found"}
 
-        cache_versions = []
-        for entry in PLUGIN_CACHE_DIR.iterdir():
-            if not entry.is_dir():
-                continue
-            ver = _detect_cache_version(entry)
-            if ver and _parse_version(ver) != (0, 0, 0):
-                cache_versions.append((ver, entry))
-            else:
-                logger.debug(f"[update] skipping cache entry: {entry.name}")
+        # Every blocking step below (cache scan, tree copies, npm, init
+        # service edits) runs on the I/O pool so IPC status/list/spawn stay
+        # responsive during a long update.
+        cache_versions = await loop.run_in_executor(self._io_pool, _scan_plugin_cache)
 
         if not cache_versions:
             logger.info(f"[update] no valid versions found in cache")
             return {"ok": True, "updated": False, "reason": "no versions in cache"}
 
-        cache_versions.sort(key=lambda x: _parse_version(x[0]), reverse=True)
-        latest_version, latest_dir = cache_versions[0]
+        # Tuples were parsed once above — max() on the precomputed key avoids
+        # re-parsing inside a sort comparator.
+        latest_parsed, latest_version, latest_dir = max(cache_versions, key=lambda x: x[0])
         logger.info(f"[update] latest in cache: {latest_version} (dir={latest_dir.name})")
 
-        if not _is_newer(latest_version, installed_plugin_version):
+        if latest_parsed <= _parse_version(installed_plugin_version):
             return {
                 "ok": True,
                 "updated": False,
@@ -774,7 +1063,6 @@ class VmuxDaemon:
 
         try:
             import shutil
-            import subprocess
             import tempfile
             import datetime
 
@@ -783,7 +1071,7 @@ class VmuxDaemon:
             #    daemon, relay, and UI all left untouched.  This avoids the
             #    "daemon bumped to N+1 but UI still on N" schema-drift state.
             src_web_dist = latest_dir / "web" / "dist"
-            staging_root = DATA_DIR / ".update-staging"
+            staging_root = DATA_DIR / f".update-staging-{uuid.uuid4().hex[:8]}"
             staged_web_dist: Optional[Path] = None
 
             if src_web_dist.exists():
@@ -819,37 +1107,28 @@ class VmuxDaemon:
 
                     with tempfile.TemporaryDirectory() as tmp:
                         build_dir = Path(tmp) / "web"
-                        shutil.copytree(str(src_web), str(build_dir))
+                        await loop.run_in_executor(self._io_pool, functools.partial(
+                            shutil.copytree, str(src_web), str(build_dir), copy_function=_clone_file,
+                        ))
 
                         logger.info("[update] running npm ci (output → update.log)")
-                        r = subprocess.run(
+                        rc = await self._run_npm(
                             [npm, "ci", "--prefer-offline", "--no-audit", "--no-fund"],
-                            cwd=str(build_dir),
-                            env=npm_env,
-                            stdout=logf,
-                            stderr=subprocess.STDOUT,
-                            timeout=300,
+                            build_dir, npm_env, logf,
                         )
-                        if r.returncode != 0:
+                        if rc != 0:
                             logger.error(
-                                f"[update] npm ci failed (exit={r.returncode}); "
+                                f"[update] npm ci failed (exit={rc}); "
                                 f"see {UPDATE_LOG}; aborting update"
                             )
                             return {"ok": False, "error": "npm ci failed; see update.log"}
 
                         logger.info("[update] running npm run build (output → update.log)")
-                        r = subprocess.run(
-                            [npm, "run", "build"],
-                            cwd=str(build_dir),
-                            env=npm_env,
-                            stdout=logf,
-                            stderr=subprocess.STDOUT,
-                            timeout=300,
-                        )
+                        rc = await self._run_npm([npm, "run", "build"], build_dir, npm_env, logf)
                         built = build_dir / "dist"
-                        if r.returncode != 0 or not built.exists():
+                        if rc != 0 or not built.exists():
                             logger.error(
-                                f"[update] npm run build failed (exit={r.returncode}); "
+                                f"[update] npm run build failed (exit={rc}); "
                                 f"see {UPDATE_LOG}; aborting update"
                             )
                             return {"ok": False, "error": "npm build failed; see update.log"}
@@ -857,107 +1136,67 @@ class VmuxDaemon:
                         # Persist the freshly-built dist to a staging dir that
                         # outlives this TemporaryDirectory so we can copy from
                         # it after the daemon/relay swap.
-                        if staging_root.exists():
-                            shutil.rmtree(staging_root)
-                        staging_root.mkdir(parents=True)
                         staged_web_dist = staging_root / "web-dist"
-                        shutil.copytree(str(built), str(staged_web_dist))
+                        await loop.run_in_executor(
+                            self._io_pool, _stage_web_dist, built, staging_root, staged_web_dist,
+                        )
                 logger.info(f"[update] web build OK; staged at {staged_web_dist}")
 
-            # 2. Daemon files: clean-replace the source while preserving the
-            #    runtime-only artifacts that do NOT live in the source tree.
-            #    .venv holds the daemon's installed deps (certifi, httpx, ...).
-            #    Deleting it here used to destroy the daemon's Python env, so
-            #    every later httpx call (e.g. `vmux send`) failed with
-            #    FileNotFoundError on the now-missing certifi CA bundle. The
-            #    vmuxd wrapper is generated by install.sh and also lives
-            #    outside the source tree. Both are preserved across the swap.
-            logger.info("[update] replacing daemon/ files (preserving .venv + wrapper)")
-            preserve = {".venv", "vmuxd"}
-            if DAEMON_DIR.exists():
-                for child in DAEMON_DIR.iterdir():
-                    if child.name in preserve:
-                        continue
-                    if child.is_dir() and not child.is_symlink():
-                        shutil.rmtree(child)
-                    else:
-                        child.unlink()
-            DAEMON_DIR.mkdir(parents=True, exist_ok=True)
-            shutil.copytree(str(src_daemon_dir), str(DAEMON_DIR), dirs_exist_ok=True)
-            # Safety net: regenerate the launch wrapper only if it went missing.
-            vmuxd_wrapper = DAEMON_DIR / "vmuxd"
-            if not vmuxd_wrapper.exists():
-                uv_path = shutil.which("uv") or str(Path.home() / ".local" / "bin" / "uv")
-                vmuxd_wrapper.write_text(
-                    f"#!/bin/bash\n"
-                    f'cd "{DAEMON_DIR}"\n'
-                    f'exec "{uv_path}" run "{DAEMON_DIR / "vmuxd.py"}" "$@"\n'
-                )
-                vmuxd_wrapper.chmod(0o755)
-                logger.info("[update] regenerated vmuxd wrapper")
-
-            # 3. Relay-server files — clean replace
+            # 2–4. Daemon files, relay-server and web dist are independent
+            #      trees, so copy them concurrently on the I/O pool instead
+            #      of walking them one after another on the event loop.
+            #      Each tree is staged next to its destination and renamed
+            #      into place (see _swap_tree / _replace_daemon_files).
             src_relay = latest_dir / "relay-server"
             dst_relay = DATA_DIR / "relay-server"
-            if src_relay.exists():
-                logger.info("[update] replacing relay-server/ files")
-                if dst_relay.exists():
-                    shutil.rmtree(dst_relay)
-                shutil.copytree(str(src_relay), str(dst_relay))
-
-            # 4. Web dist — copy from the staged build (or pre-built cache copy)
             dst_web_dist = DATA_DIR / "web" / "dist"
             dst_web_dist.parent.mkdir(parents=True, exist_ok=True)
+
+            logger.info("[update] replacing daemon/ files (preserving .venv + wrapper)")
+            jobs = [loop.run_in_executor(self._io_pool, _replace_daemon_files, src_daemon_dir)]
+            if src_relay.exists():
+                logger.info("[update] replacing relay-server/ files")
+                jobs.append(loop.run_in_executor(self._io_pool, _swap_tree, src_relay, dst_relay))
             logger.info(f"[update] installing web/dist from {staged_web_dist}")
-            if dst_web_dist.exists():
-                shutil.rmtree(dst_web_dist)
-            shutil.copytree(str(staged_web_dist), str(dst_web_dist))
+            jobs.append(loop.run_in_executor(self._io_pool, _swap_tree, staged_web_dist, dst_web_dist))
+            results = await asyncio.gather(*jobs)
+
+            # Displaced trees are no longer referenced — delete them in the
+            # background rather than holding up the update.
+            for old_tree in results:
+                if old_tree is not None:
+                    loop.run_in_executor(self._io_pool, shutil.rmtree, old_tree, True)
+
             # Clean up staging dir if it was a fresh build (cache pre-built
             # source path is a read-only reference under PLUGIN_CACHE_DIR; only
             # remove the staging tree if we created it).
             if staging_root.exists():
-                shutil.rmtree(staging_root, ignore_errors=True)
+                await loop.run_in_executor(
+                    self._io_pool, functools.partial(shutil.rmtree, staging_root, ignore_errors=True),
+                )
 
             # 5. Update init service VMUX_PLUGIN_DIR
             if sys.platform == "darwin":
-                plist_path = Path.home() / "Library" / "LaunchAgents" / "com.vmux.daemon.plist"
-                if plist_path.exists():
-                    try:
-                        import plistlib
-                        with open(plist_path, "rb") as f:
-                            plist = plistlib.load(f)
-                        env_vars = plist.get("EnvironmentVariables", {})
-                        env_vars["VMUX_PLUGIN_DIR"] = str(latest_dir)
-                        plist["EnvironmentVariables"] = env_vars
-                        with open(plist_path, "wb") as f:
-                            plistlib.dump(plist, f)
+                try:
+                    if await loop.run_in_executor(self._io_pool, _update_launchd_plist, latest_dir):
                         logger.info(f"[update] plist updated: VMUX_PLUGIN_DIR → {latest_dir}")
-                    except Exception as e:
-                        logger.warning(f"[update] plist update failed: {e}")
+                except Exception as e:
+                    logger.warning(f"[update] plist update failed: {e}")
             else:
-                import re as _re
-                unit_path = Path.home() / ".config" / "systemd" / "user" / "vmuxd.service"
-                if unit_path.exists():
-                    try:
-                        content = unit_path.read_text()
-                        content = _re.sub(
-                            r'Environment=VMUX_PLUGIN_DIR=.*',
-                            f'Environment=VMUX_PLUGIN_DIR={latest_dir}',
-                            content,
-                        )
-                        unit_path.write_text(content)
+                try:
+                    if await loop.run_in_executor(self._io_pool, _update_systemd_unit, latest_dir):
                         await asyncio.create_subprocess_exec(
                             "systemctl", "--user", "daemon-reload"
                         )
                         logger.info(f"[update] systemd unit updated: VMUX_PLUGIN_DIR → {latest_dir}")
-                    except Exception as e:
-                        logger.warning(f"[update] systemd unit update failed: {e}")
+                except Exception as e:
+                    logger.warning(f"[update] systemd unit update failed: {e}")
 
             # 6. Persist the new installed plugin version.  This is now the
             #    source of truth for "what plugin did we install assets
             #    from?" — independent of daemon/VERSION, which only moves
             #    when the daemon binary itself changes.
-            _write_installed_plugin_version(latest_version)
+            await loop.run_in_executor(self._io_pool, _write_installed_plugin_version, latest_version)
 
             # 7. Pick a restart strategy.  If the daemon binary changed,
             #    schedule a full daemon restart so launchd respawns from
@@ -994,13 +1233,24 @@ class VmuxDaemon:
             return {"ok": False, "error": str(e)}
 
     async def _state_writer_loop(self):
-        """Periodically write daemon.state for external process management."""
+        """Write daemon.state for external process management.
+
+        Event-driven: the service and session managers set `_state_dirty`
+        whenever a PID or the session set changes (SIGUSR1 sets it too).
+        A slow heartbeat keeps `updated_at` fresh on an idle daemon.
+        """
         while True:
             try:
-                await asyncio.sleep(10)
+                try:
+                    await asyncio.wait_for(self._state_dirty.wait(), timeout=STATE_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                self._state_dirty.clear()
                 pids = self._service_manager.get_pids()
                 sessions = await self._session_manager.list_sessions()
-                _write_state(pids, sessions)
+                await asyncio.get_running_loop().run_in_executor(
+                    self._io_pool, _write_state, pids, sessions,
+                )
             except asyncio.CancelledError:
                 break
             except Exception:
@@ -1200,6 +1450,235 @@ class VmuxDaemon:
             return None
 
 
+def _scan_plugin_cache() -> list[tuple[tuple, str, Path]]:
+    """Return (parsed_version, version, dir) for every versioned cache entry."""
+    cache_versions = []
+    # scandir's DirEntry.is_dir() is answered from d_type, so there's no
+    # extra stat() per entry as with Path.iterdir() + is_dir().
+    with os.scandir(PLUGIN_CACHE_DIR) as it:
+        for dirent in it:
+            if not dirent.is_dir():
+                continue
+            entry = Path(dirent.path)
+            ver = _detect_cache_version(entry)
+            parsed = _parse_version(ver) if ver else (0, 0, 0)
+            if parsed != (0, 0, 0):
+                cache_versions.append((parsed, ver, entry))
+            else:
+                logger.debug(f"[update] skipping cache entry: {entry.name}")
+    return cache_versions
+
+
+def _plugin_cache_signature() -> Optional[tuple]:
+    """Cheap change token for the plugin cache: stats only, no JSON parsing.
+
+    Covers the cache dir itself (versions added/removed), each version dir,
+    and the plugin.json files _detect_cache_version reads — rewriting one
+    in place doesn't touch any directory mtime.  None if the cache is
+    unreadable, which callers treat as "changed".
+    """
+    try:
+        sig = [PLUGIN_CACHE_DIR.stat().st_mtime_ns]
+        with os.scandir(PLUGIN_CACHE_DIR) as it:
+            for dirent in it:
+                if not dirent.is_dir():
+                    continue
+                entry = [dirent.name, dirent.stat().st_mtime_ns]
+                for rel in (os.path.join(".claude-plugin", "plugin.json"), "plugin.json"):
+                    try:
+                        entry.append(os.stat(os.path.join(dirent.path, rel)).st_mtime_ns)
+                    except OSError:
+                        entry.append(None)
+                sig.append(tuple(entry))
+    except OSError:
+        return None
+    sig[1:] = sorted(sig[1:])
+    return tuple(sig)
+
+
+def _kill_process_group(proc) -> None:
+    """SIGKILL proc's process group (it was started with start_new_session)."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _stage_web_dist(built: Path, staging_root: Path, staged_web_dist: Path) -> None:
+    """Copy a fresh web build into a clean, per-update staging dir.
+
+    Staging dirs left behind by interrupted updates are swept first.
+    """
+    import shutil
+    for leftover in staging_root.parent.glob(".update-staging*"):
+        if leftover != staging_root:
+            shutil.rmtree(leftover, ignore_errors=True)
+    if staging_root.exists():
+        shutil.rmtree(staging_root)
+    staging_root.mkdir(parents=True)
+    shutil.copytree(str(built), str(staged_web_dist), copy_function=_clone_file)
+
+
+def _update_launchd_plist(latest_dir: Path) -> bool:
+    """Point the launchd plist's VMUX_PLUGIN_DIR at latest_dir.  False if no plist.
+
+    Also moves StandardOutPath off the rotated daemon.log for plists
+    written by older installers.
+    """
+    import plistlib
+    plist_path = Path.home() / "Library" / "LaunchAgents" / "com.vmux.daemon.plist"
+    if not plist_path.exists():
+        return False
+    with open(plist_path, "rb") as f:
+        plist = plistlib.load(f)
+    env_vars = plist.get("EnvironmentVariables", {})
+    env_vars["VMUX_PLUGIN_DIR"] = str(latest_dir)
+    plist["EnvironmentVariables"] = env_vars
+    if plist.get("StandardOutPath") == str(LOG_DIR / "daemon.log"):
+        plist["StandardOutPath"] = str(DAEMON_STDOUT_LOG)
+    with open(plist_path, "wb") as f:
+        plistlib.dump(plist, f)
+    return True
+
+
+def _update_systemd_unit(latest_dir: Path) -> bool:
+    """Point the systemd unit's VMUX_PLUGIN_DIR at latest_dir.  False if no unit.
+
+    Also moves StandardOutput off the rotated daemon.log for units written
+    by older installers.
+    """
+    import re
+    unit_path = Path.home() / ".config" / "systemd" / "user" / "vmuxd.service"
+    if not unit_path.exists():
+        return False
+    content = unit_path.read_text()
+    content = re.sub(
+        r'Environment=VMUX_PLUGIN_DIR=.*',
+        f'Environment=VMUX_PLUGIN_DIR={latest_dir}',
+        content,
+    )
+    content = content.replace(
+        f"StandardOutput=append:{LOG_DIR / 'daemon.log'}",
+        f"StandardOutput=append:{DAEMON_STDOUT_LOG}",
+    )
+    unit_path.write_text(content)
+    return True
+
+
+_libc_clonefile = None
+
+
+def _clone_file(src: str, dst: str) -> str:
+    """copytree copy_function: APFS clonefile(2) on macOS, copy2 elsewhere.
+
+    A clone is a copy-on-write metadata operation, so copying the web dist
+    and relay trees costs O(files) instead of O(bytes).  Falls back to
+    shutil.copy2 (which already uses sendfile on Linux) whenever cloning
+    isn't possible — non-APFS volume, cross-device, or dst already exists.
+    """
+    global _libc_clonefile
+    import shutil
+    if sys.platform == "darwin":
+        if _libc_clonefile is None:
+            try:
+                import ctypes
+                _libc_clonefile = ctypes.CDLL("libc.dylib", use_errno=True).clonefile
+            except (OSError, AttributeError):
+                _libc_clonefile = False
+        if _libc_clonefile and _libc_clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            return dst
+    return shutil.copy2(src, dst)
+
+
+def _replace_daemon_files(src_daemon_dir: Path) -> Optional[Path]:
+    """Swap in a fresh DAEMON_DIR from src while preserving runtime-only artifacts.
+
+    .venv holds the daemon's installed deps (certifi, httpx, ...).  Deleting
+    it here used to destroy the daemon's Python env, so every later httpx
+    call (e.g. `vmux send`) failed with FileNotFoundError on the now-missing
+    certifi CA bundle.  The vmuxd wrapper is generated by install.sh and also
+    lives outside the source tree.  Both are preserved across the swap.
+
+    Same staged swap as _swap_tree: copy into `daemon.new-<id>`, move the
+    preserved entries across (a rename, so the venv is never copied), then
+    rename the new tree into place.  The running daemon's files are never
+    deleted out from under it.  Returns the displaced `daemon.old-<id>` tree
+    for the caller to delete, or None if DAEMON_DIR did not exist.
+    """
+    import shutil
+    preserve = (".venv", "vmuxd")
+    staged, old = _swap_paths(DAEMON_DIR)
+    shutil.copytree(str(src_daemon_dir), str(staged), copy_function=_clone_file)
+
+    displaced = None
+    if DAEMON_DIR.exists():
+        for name in preserve:
+            current = DAEMON_DIR / name
+            if not (current.exists() or current.is_symlink()):
+                continue
+            target = staged / name
+            if target.is_dir() and not target.is_symlink():
+                shutil.rmtree(target)
+            elif target.exists() or target.is_symlink():
+                target.unlink()
+            os.replace(current, target)
+        os.replace(DAEMON_DIR, old)
+        displaced = old
+    os.replace(staged, DAEMON_DIR)
+
+    # Safety net: regenerate the launch wrapper only if it went missing.
+    vmuxd_wrapper = DAEMON_DIR / "vmuxd"
+    if not vmuxd_wrapper.exists():
+        uv_path = shutil.which("uv") or str(Path.home() / ".local" / "bin" / "uv")
+        vmuxd_wrapper.write_text(
+            f"#!/bin/bash\n"
+            f'cd "{DAEMON_DIR}"\n'
+            f'exec "{uv_path}" run "{DAEMON_DIR / "vmuxd.py"}" "$@"\n'
+        )
+        vmuxd_wrapper.chmod(0o755)
+        logger.info("[update] regenerated vmuxd wrapper")
+    return displaced
+
+
+def _swap_paths(dst: Path) -> tuple[Path, Path]:
+    """Per-call (staged, old) siblings for a swap of dst.
+
+    The names are unique per call, so a second swap of the same dst can
+    never rmtree a staging tree the first one is still filling.  Leftovers
+    from an interrupted update (crash between copy and rename) are swept
+    here; the caller holds _update_running, so none of them are live.
+    """
+    import shutil
+    for pattern in (f"{dst.name}.new-*", f"{dst.name}.old-*"):
+        for leftover in dst.parent.glob(pattern):
+            shutil.rmtree(leftover, ignore_errors=True)
+    token = uuid.uuid4().hex[:8]
+    return (
+        dst.with_name(f"{dst.name}.new-{token}"),
+        dst.with_name(f"{dst.name}.old-{token}"),
+    )
+
+
+def _swap_tree(src: Path, dst: Path) -> Optional[Path]:
+    """Replace dst with a copy of src via copy-then-rename.
+
+    The copy lands in a sibling `<dst>.new-<id>` directory and is renamed
+    into place, so dst is only ever missing for the instant between two
+    renames (never for the duration of a copy).  Returns the displaced
+    `<dst>.old-<id>` tree for the caller to delete, or None if dst did not
+    exist.
+    """
+    import shutil
+    staged, old = _swap_paths(dst)
+    shutil.copytree(str(src), str(staged), copy_function=_clone_file)
+    displaced = None
+    if dst.exists():
+        os.replace(dst, old)
+        displaced = old
+    os.replace(staged, dst)
+    return displaced
+
+
 def _resolve_npm() -> Optional[str]:
     """Find an absolute path to npm.  launchd's default PATH excludes
     /opt/homebrew/bin, /usr/local/bin, ~/.nvm shims, etc., so subprocess
@@ -1227,6 +1706,38 @@ def _build_npm_env() -> dict:
     return env
 
 
+# path → ((st_ino, st_mtime_ns, st_ctime_ns, st_size), value).  Version
+# files are re-read on every status call and update poll but almost never
+# change, so a stat() is enough to decide whether the cached value is still
+# good.  mtime and size alone aren't: an update copies VERSION with copy2 /
+# clonefile (source mtime kept) and the size rarely differs, but the swap
+# always lands a new inode, and ctime can't be carried over by a copy.
+_stat_cache: dict[Path, tuple[tuple[int, int, int, int], object]] = {}
+
+
+def _read_stat_cached(path: Path, load):
+    """Return load(path), reusing the previous result while path is unchanged.
+
+    Raises OSError if path can't be stat'ed.
+    """
+    st = path.stat()
+    key = (st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+    hit = _stat_cache.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    value = load(path)
+    _stat_cache[path] = (key, value)
+    return value
+
+
+def _load_stripped_text(path: Path) -> str:
+    return path.read_text().strip()
+
+
+def _load_plugin_json_version(path: Path) -> str:
+    return _json_loads(path.read_bytes()).get("version", "")
+
+
 def _detect_cache_version(cache_entry: Path) -> str:
     """Extract version from a plugin cache directory.
 
@@ -1239,14 +1750,12 @@ def _detect_cache_version(cache_entry: Path) -> str:
         cache_entry / ".claude-plugin" / "plugin.json",
         cache_entry / "plugin.json",
     ]:
-        if json_path.exists():
-            try:
-                data = json.loads(json_path.read_text())
-                ver = data.get("version", "")
-                if ver:
-                    return ver
-            except Exception:
-                continue
+        try:
+            ver = _read_stat_cached(json_path, _load_plugin_json_version)
+            if ver:
+                return ver
+        except Exception:
+            continue
     # Fall back to directory name
     name = cache_entry.name
     if _parse_version(name) != (0, 0, 0):
@@ -1257,7 +1766,7 @@ def _detect_cache_version(cache_entry: Path) -> str:
 def _read_installed_version() -> str:
     """Version of the installed daemon binary (daemon/VERSION)."""
     try:
-        return VERSION_FILE.read_text().strip()
+        return _read_stat_cached(VERSION_FILE, _load_stripped_text)
     except Exception:
         return "0.0.0"
 
@@ -1271,7 +1780,7 @@ def _read_installed_plugin_version() -> str:
     PLUGIN_VERSION explicitly so they stay decoupled.
     """
     try:
-        return PLUGIN_VERSION_FILE.read_text().strip()
+        return _read_stat_cached(PLUGIN_VERSION_FILE, _load_stripped_text)
     except Exception:
         return _read_installed_version()
 
@@ -1284,17 +1793,16 @@ def _write_installed_plugin_version(v: str) -> None:
         logger.warning(f"[update] failed to write PLUGIN_VERSION: {e}")
 
 
+@functools.lru_cache(maxsize=256)
 def _parse_version(v: str) -> tuple:
+    # Cached: the set of version strings seen at runtime is tiny, and this
+    # is hit on every update poll.
     try:
         return tuple(int(x) for x in v.split("."))
     except Exception:
         return (0, 0, 0)
 
 
-def _is_newer(candidate: str, current: str) -> bool:
-    return _parse_version(candidate) > _parse_version(current)
-
-
 if __name__ == "__main__":
     # Add daemon directory to sys.path so local imports work
     daemon_dir = os.path.dirname(os.path.abspath(__file__))
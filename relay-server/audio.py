@@ -1,6 +1,6 @@
 """Audio pipeline: Whisper STT and Kokoro TTS via OpenAI-compatible APIs."""
 
-import io
+import secrets
 from collections.abc import AsyncGenerator
 from typing import Optional
 
@@ -28,6 +28,26 @@ def _get_client() -> httpx.AsyncClient:
     return _http_client
 
 
+def _encode_multipart(fields: dict[str, str], filename: str, content_type: str, data: bytes) -> tuple[bytes, str]:
+    """Build a multipart/form-data body with a single file part.
+
+    Whisper uploads are several MB of WAV; joining the envelope around
+    the bytes directly skips the BytesIO wrapper and httpx's chunked
+    multipart encoder.  Returns (body, content_type_header).
+    """
+    boundary = secrets.token_hex(16)
+    head = "".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+        for name, value in fields.items()
+    )
+    head += (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    )
+    body = b"".join((head.encode(), data, f"\r\n--{boundary}--\r\n".encode()))
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
 async def transcribe(audio_data: bytes, audio_format: str = "webm") -> Optional[str]:
     """Transcribe audio using Whisper via OpenAI-compatible API.
 
@@ -41,15 +61,15 @@ async def transcribe(audio_data: bytes, audio_format: str = "webm") -> Optional[
     url = f"{WHISPER_URL}/audio/transcriptions"
     client = _get_client()
 
-    files = {
-        "file": (f"audio.{audio_format}", io.BytesIO(audio_data), f"audio/{audio_format}"),
-    }
-    data = {
-        "model": WHISPER_MODEL,
-    }
+    body, content_type = _encode_multipart(
+        {"model": WHISPER_MODEL},
+        f"audio.{audio_format}", f"audio/{audio_format}", audio_data,
+    )
 
     try:
-        response = await client.post(url, files=files, data=data, timeout=30.0)
+        response = await client.post(
+            url, content=body, headers={"Content-Type": content_type}, timeout=30.0,
+        )
         response.raise_for_status()
         result = response.json()
         return result.get("text", "").strip()
@@ -123,15 +143,25 @@ async def synthesize_pcm_stream(
         # responses can take minutes to stream, so a total timeout truncates audio.
         async with client.stream("POST", url, json=payload, timeout=Timeout(connect=10.0, read=120.0, write=10.0, pool=10.0)) as response:
             response.raise_for_status()
+            # Consume from a read offset instead of deleting each emitted
+            # prefix — del buffer[:n] memmoves the whole tail every chunk.
+            # The consumed prefix is compacted away once it passes 64 KB.
             buffer = bytearray()
+            off = 0
             async for raw_chunk in response.aiter_bytes():
                 buffer.extend(raw_chunk)
-                while len(buffer) >= chunk_size:
-                    yield bytes(buffer[:chunk_size])
-                    del buffer[:chunk_size]
+                if len(buffer) - off >= chunk_size:
+                    # The view must be released before the next extend().
+                    with memoryview(buffer) as mv:
+                        while len(buffer) - off >= chunk_size:
+                            yield bytes(mv[off:off + chunk_size])
+                            off += chunk_size
+                if off >= 65536:
+                    del buffer[:off]
+                    off = 0
             # Yield any remaining bytes
-            if buffer:
-                yield bytes(buffer)
+            if off < len(buffer):
+                yield bytes(buffer[off:])
     except Exception as e:
         print(f"TTS stream error: {e}")
         return
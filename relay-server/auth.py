@@ -1,9 +1,13 @@
 """Device authentication: JWT tokens, pairing codes, and device management."""
 
+import heapq
+import hmac
 import json
-import random
+import os
+import secrets
 import time
 import uuid
+from collections import OrderedDict, deque
 from pathlib import Path
 from typing import Optional
 
@@ -11,47 +15,110 @@ import jwt
 
 from config import AUTH_SECRET, AUTH_TOKEN_TTL_DAYS, AUTH_ENABLED
 
+# orjson is optional — used for devices.json when installed.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps_indented(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_indented(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
 DEVICES_FILE = Path.home() / ".claude" / "voice-multiplexer" / "devices.json"
 CODE_TTL_S = 60
 COOKIE_NAME = "vmux_token"  # kept for backwards compat (WS handshake uses cookies)
 
 # In-memory store for pending pairing codes: {code: {expires_at}}
 _pending_codes: dict[str, dict] = {}
+# Min-heap of (expires_at, code) for expiry sweeps.  Entries for codes that
+# were already consumed are skipped lazily when they reach the top.
+_pending_heap: list[tuple[float, str]] = []
 
-# Rate limiting for pairing attempts: {ip: [timestamps]}
-_pair_attempts: dict[str, list[float]] = {}
+# Rate limiting for pairing attempts: {ip: deque of timestamps, oldest first}
+_pair_attempts: dict[str, deque[float]] = {}
 PAIR_RATE_LIMIT = 5  # max attempts per window
 PAIR_RATE_WINDOW = 60  # window in seconds
 
+# Verified JWT payloads keyed by raw token (LRU) — skips the HMAC check on
+# repeat requests.  Expiry is re-checked on every hit, and revocation is
+# still enforced below through the device-id set.
+_token_cache: OrderedDict[str, dict] = OrderedDict()
+TOKEN_CACHE_SIZE = 1024
 
-def _load_devices() -> list[dict]:
+# last_seen updates waiting for flush_last_seen(): {device_id: timestamp}
+_last_seen_pending: dict[str, float] = {}
+
+
+# Parsed devices.json keyed by (st_mtime_ns, st_size) — validate_token runs
+# on every authenticated request, so only re-read when the file changes.
+# Entry: (stat_key, devices, device_ids).
+_devices_cache: Optional[tuple[tuple[int, int], list[dict], frozenset[str]]] = None
+
+
+def _stat_key(st: os.stat_result) -> tuple[int, int]:
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _cache_devices(key: tuple[int, int], devices: list[dict]):
+    global _devices_cache
+    _devices_cache = (key, devices, frozenset(d["device_id"] for d in devices))
+
+
+def _cached_devices():
+    """Return the current cache entry, re-parsing devices.json if it changed."""
+    global _devices_cache
     try:
-        if DEVICES_FILE.exists():
-            return json.loads(DEVICES_FILE.read_text())
-    except (json.JSONDecodeError, OSError):
-        pass
-    return []
+        key = _stat_key(DEVICES_FILE.stat())
+    except OSError:
+        _devices_cache = None
+        return None
+    if _devices_cache is None or _devices_cache[0] != key:
+        try:
+            _cache_devices(key, _json_loads(DEVICES_FILE.read_bytes()))
+        except (ValueError, KeyError, TypeError, OSError):
+            return None
+    return _devices_cache
+
+
+def _load_devices() -> list[dict]:
+    entry = _cached_devices()
+    return list(entry[1]) if entry else []
 
 
 def _save_devices(devices: list[dict]):
     DEVICES_FILE.parent.mkdir(parents=True, exist_ok=True)
-    DEVICES_FILE.write_text(json.dumps(devices, indent=2))
+    # Write-then-rename so a crash mid-write can't truncate the device list
+    # (a corrupt file loads as empty and would unpair every device).
+    tmp_path = DEVICES_FILE.with_suffix(".json.tmp")
+    tmp_path.write_bytes(_json_dumps_indented(devices))
+    os.replace(tmp_path, DEVICES_FILE)
+    _cache_devices(_stat_key(DEVICES_FILE.stat()), list(devices))
 
 
-def _device_ids() -> set[str]:
-    return {d["device_id"] for d in _load_devices()}
+def _device_ids() -> frozenset[str]:
+    entry = _cached_devices()
+    return entry[2] if entry else frozenset()
 
 
 def generate_pair_code() -> str:
     """Generate a 6-digit pairing code valid for CODE_TTL_S seconds."""
     # Clean up expired codes
     now = time.time()
-    expired = [c for c, v in _pending_codes.items() if v["expires_at"] < now]
-    for c in expired:
-        del _pending_codes[c]
-
-    code = f"{random.randint(0, 999999):06d}"
-    _pending_codes[code] = {"expires_at": now + CODE_TTL_S}
+    while _pending_heap and _pending_heap[0][0] < now:
+        expires_at, c = heapq.heappop(_pending_heap)
+        entry = _pending_codes.get(c)
+        if entry is not None and entry["expires_at"] == expires_at:
+            del _pending_codes[c]
+
+    code = f"{secrets.randbelow(1_000_000):06d}"
+    expires_at = now + CODE_TTL_S
+    _pending_codes[code] = {"expires_at": expires_at}
+    heapq.heappush(_pending_heap, (expires_at, code))
     return code
 
 
@@ -61,10 +128,10 @@ def check_pair_rate_limit(client_ip: str) -> bool:
     Returns True if the request is allowed, False if rate-limited.
     """
     now = time.time()
-    attempts = _pair_attempts.get(client_ip, [])
-    # Prune old attempts outside the window
-    attempts = [t for t in attempts if now - t < PAIR_RATE_WINDOW]
-    _pair_attempts[client_ip] = attempts
+    attempts = _pair_attempts.setdefault(client_ip, deque())
+    # Prune old attempts outside the window (timestamps are appended in order)
+    while attempts and now - attempts[0] >= PAIR_RATE_WINDOW:
+        attempts.popleft()
     if len(attempts) >= PAIR_RATE_LIMIT:
         return False
     attempts.append(now)
@@ -80,7 +147,7 @@ def cleanup_stale_rate_limits():
     now = time.time()
     stale_ips = [
         ip for ip, timestamps in _pair_attempts.items()
-        if not timestamps or all(now - t >= PAIR_RATE_WINDOW for t in timestamps)
+        if not timestamps or now - timestamps[-1] >= PAIR_RATE_WINDOW
     ]
     for ip in stale_ips:
         del _pair_attempts[ip]
@@ -94,6 +161,17 @@ def validate_pair_code(code: str) -> bool:
     return entry["expires_at"] >= time.time()
 
 
+def compare_secret(provided: Optional[str], expected: str) -> bool:
+    """Constant-time comparison for shared secrets (e.g. the daemon secret).
+
+    Use this instead of == for any secret received from a client so the
+    comparison time doesn't leak how many leading characters matched.
+    """
+    if not provided or not expected:
+        return False
+    return hmac.compare_digest(provided.encode(), expected.encode())
+
+
 def issue_token(device_id: str, device_name: str) -> str:
     """Issue a JWT for an authorized device."""
     payload = {
@@ -109,10 +187,18 @@ def validate_token(token: str) -> Optional[dict]:
     """Decode and validate a JWT. Returns payload dict or None."""
     if not AUTH_ENABLED:
         return None
-    try:
-        payload = jwt.decode(token, AUTH_SECRET, algorithms=["HS256"])
-    except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
-        return None
+    payload = _token_cache.get(token)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        _token_cache.move_to_end(token)
+    else:
+        try:
+            payload = jwt.decode(token, AUTH_SECRET, algorithms=["HS256"])
+        except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
+            _token_cache.pop(token, None)
+            return None
+        _token_cache[token] = payload
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
 
     # Check device is still authorized
     if payload.get("device_id") not in _device_ids():
@@ -123,10 +209,10 @@ def validate_token(token: str) -> Optional[dict]:
 
 def register_device(device_id: str, device_name: str):
     """Add a device to the authorized devices list."""
-    devices = _load_devices()
-    # Don't duplicate
-    if any(d["device_id"] == device_id for d in devices):
+    # Don't duplicate — the cached id set answers re-registration without a scan
+    if device_id in _device_ids():
         return
+    devices = _load_devices()
     devices.append({
         "device_id": device_id,
         "device_name": device_name,
@@ -137,8 +223,15 @@ def register_device(device_id: str, device_name: str):
 
 
 def list_devices() -> list[dict]:
-    """Return all authorized devices."""
-    return _load_devices()
+    """Return all authorized devices, including not-yet-flushed last_seen times."""
+    devices = _load_devices()
+    if _last_seen_pending:
+        devices = [
+            {**d, "last_seen": _last_seen_pending[d["device_id"]]}
+            if d["device_id"] in _last_seen_pending else d
+            for d in devices
+        ]
+    return devices
 
 
 def revoke_device(device_id: str) -> bool:
@@ -152,10 +245,34 @@ def revoke_device(device_id: str) -> bool:
 
 
 def update_last_seen(device_id: str):
-    """Update the last_seen timestamp for a device."""
-    devices = _load_devices()
-    for d in devices:
-        if d["device_id"] == device_id:
-            d["last_seen"] = time.time()
+    """Record the last_seen timestamp for a device.
+
+    Called on every authenticated HTTP request, so the write is deferred —
+    flush_last_seen() persists pending timestamps in one devices.json write.
+    """
+    _last_seen_pending[device_id] = time.time()
+
+
+def flush_last_seen():
+    """Write pending last_seen timestamps to devices.json.
+
+    Called periodically by the server's memory cleanup loop and on shutdown.
+    Timestamps for devices revoked in the meantime are dropped.  If the
+    write fails they go back into the pending batch (newer touches win)
+    and the error propagates.
+    """
+    if not _last_seen_pending:
+        return
+    pending = dict(_last_seen_pending)
+    _last_seen_pending.clear()
+    try:
+        devices = [
+            {**d, "last_seen": pending[d["device_id"]]} if d["device_id"] in pending else d
+            for d in _load_devices()
+        ]
+        if any(d["device_id"] in pending for d in devices):
             _save_devices(devices)
-            return
+    except BaseException:
+        for device_id, ts in pending.items():
+            _last_seen_pending.setdefault(device_id, ts)
+        raise
@@ -5,6 +5,9 @@ Configuration is loaded from ~/.claude/voice-multiplexer/voice-multiplexer.env.
 """
 
 import os
+import re
+import stat
+import tempfile
 from pathlib import Path
 
 # Load voice-multiplexer.env from the data directory
@@ -81,27 +84,49 @@ def update_setting(key: str, value):
     _runtime_settings[key] = value
 
 
+# Runtime setting → env var written back by _persist_settings().
+_SETTINGS_ENV_VARS = {
+    "kokoro_voice": "KOKORO_VOICE",
+    "kokoro_speed": "KOKORO_SPEED",
+    "vad_aggressiveness": "VAD_AGGRESSIVENESS",
+    "silence_threshold_ms": "SILENCE_THRESHOLD_MS",
+    "min_speech_duration_s": "MIN_SPEECH_DURATION_S",
+}
+_SETTINGS_PATTERNS = {
+    key: re.compile(rf"^{re.escape(env_var)}=.*$", re.MULTILINE)
+    for key, env_var in _SETTINGS_ENV_VARS.items()
+}
+
+
 def _persist_settings():
-    """Write current runtime settings back to the env file."""
-    env_path = Path.home() / ".claude" / "voice-multiplexer" / "voice-multiplexer.env"
-    _env_mapping = {
-        "kokoro_voice": "KOKORO_VOICE",
-        "kokoro_speed": "KOKORO_SPEED",
-        "vad_aggressiveness": "VAD_AGGRESSIVENESS",
-        "silence_threshold_ms": "SILENCE_THRESHOLD_MS",
-        "min_speech_duration_s": "MIN_SPEECH_DURATION_S",
-    }
+    """Write current runtime settings back to the env file.
+
+    Skips the write when nothing changed; otherwise replaces the file
+    atomically (keeping its permissions — it also holds AUTH_SECRET).
+    """
     try:
-        content = env_path.read_text()
-        import re
-        for key, env_var in _env_mapping.items():
-            value = str(_runtime_settings[key])
-            pattern = rf'^{re.escape(env_var)}=.*$'
-            if re.search(pattern, content, re.MULTILINE):
-                content = re.sub(pattern, f'{env_var}={value}', content, flags=re.MULTILINE)
-            else:
-                content = content.rstrip() + f'\n{env_var}={value}\n'
-        env_path.write_text(content)
+        original = _env_path.read_text()
+        content = original
+        for key, env_var in _SETTINGS_ENV_VARS.items():
+            line = f"{env_var}={_runtime_settings[key]}"
+            content, found = _SETTINGS_PATTERNS[key].subn(lambda _m: line, content)
+            if not found:
+                content = content.rstrip() + f"\n{line}\n"
+        if content == original:
+            return
+        # Replace the symlink target, not the link.  mkstemp creates the
+        # temp file 0600, so AUTH_SECRET is never readable under a looser
+        # umask before fchmod copies the original mode over.
+        target = _env_path.resolve()
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                os.fchmod(f.fileno(), stat.S_IMODE(target.stat().st_mode))
+                f.write(content)
+            os.replace(tmp_name, target)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
     except Exception as e:
         import logging
         logging.getLogger("relay.config").error(f"Failed to persist settings: {e}")
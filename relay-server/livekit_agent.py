@@ -16,6 +16,7 @@ import collections
 import gc
 import io
 import json
+import math
 import re
 import struct
 import time
@@ -24,6 +25,18 @@ from typing import Optional
 import numpy as np
 from livekit import api, rtc
 
+# Optional audio deps — imported once here rather than inside the audio
+# loop and per-utterance paths.  Missing webrtcvad disables speech
+# detection; missing scipy fails transcription with a clear error.
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+try:
+    from scipy import signal as scipy_signal
+except ImportError:
+    scipy_signal = None
+
 
 _VMUXD_SOCKET_PATH = "/tmp/vmuxd.sock"
 
@@ -78,6 +91,12 @@ NUM_CHANNELS = 1
 LIVEKIT_INPUT_RATE = 48000  # LiveKit always delivers 48kHz audio
 VAD_FRAME_MS = 10  # WebRTC VAD frame size — matches LiveKit's 10ms frames
 
+# Integer up/down ratio for the 48kHz → STT_SAMPLE_RATE polyphase resample
+# (1/3 for the default 16kHz).
+_STT_RESAMPLE_GCD = math.gcd(LIVEKIT_INPUT_RATE, STT_SAMPLE_RATE)
+_STT_RESAMPLE_UP = STT_SAMPLE_RATE // _STT_RESAMPLE_GCD
+_STT_RESAMPLE_DOWN = LIVEKIT_INPUT_RATE // _STT_RESAMPLE_GCD
+
 # Maximum audio buffer size in frames.  At 10ms/frame, 180s = 18000 frames.
 # We add 10% headroom.  On overflow we TRANSCRIBE (not discard) audio.
 _MAX_AUDIO_BUFFER_FRAMES = int(MAX_RECORDING_S / (VAD_FRAME_MS / 1000) * 1.1)
@@ -267,6 +286,10 @@ class SessionRoom:
         self.room: rtc.Optional[Room] = None
         self.audio_source: rtc.Optional[AudioSource] = None
         self._local_audio_track: Optional[rtc.LocalAudioTrack] = None
+        # Reused 10ms output frame for TTS publishing (and a numpy view of
+        # its buffer) — created on first use in _publish_audio_chunk.
+        self._tts_frame: Optional[rtc.AudioFrame] = None
+        self._tts_frame_view: Optional[np.ndarray] = None
         self._running = False
 
         # Audio/VAD state
@@ -308,11 +331,10 @@ class SessionRoom:
         self._running = True
 
         # Initialize VAD
-        try:
-            import webrtcvad
+        if webrtcvad is not None:
             self._vad_aggressiveness = get_setting("vad_aggressiveness")
             self._vad = webrtcvad.Vad(self._vad_aggressiveness)
-        except ImportError:
+        else:
             print(f"[room:{self.room_name}] ERROR: webrtcvad not installed — speech detection disabled")
 
         self.room = rtc.Room()
@@ -359,26 +381,16 @@ class SessionRoom:
         """Disconnect from LiveKit room and clean up all resources."""
         self._running = False
 
-        # Cancel response worker
-        if self._response_worker_task and not self._response_worker_task.done():
-            self._response_worker_task.cancel()
-            try:
-                await self._response_worker_task
-            except (asyncio.CancelledError, Exception):
-                pass
-        self._response_worker_task = None
-
-        # Cancel all audio stream tasks and wait for them to finish cleanup
-        tasks_to_cancel = []
-        for task in self._audio_stream_tasks.values():
-            if not task.done():
-                task.cancel()
-                tasks_to_cancel.append(task)
+        # Cancel the response worker and all audio stream tasks together,
+        # then wait for their cleanup (stream.aclose() etc.) in one pass
+        tasks_to_cancel = [
+            task for task in (self._response_worker_task, *self._audio_stream_tasks.values())
+            if task and not task.done()
+        ]
         for task in tasks_to_cancel:
-            try:
-                await task
-            except (asyncio.CancelledError, Exception):
-                pass
+            task.cancel()
+        await asyncio.gather(*tasks_to_cancel, return_exceptions=True)
+        self._response_worker_task = None
         self._audio_stream_tasks.clear()
 
         # Cancel timers
@@ -599,7 +611,6 @@ class SessionRoom:
                     current_agg = get_setting("vad_aggressiveness")
                     if current_agg != self._vad_aggressiveness:
                         try:
-                            import webrtcvad
                             self._vad_aggressiveness = current_agg
                             self._vad = webrtcvad.Vad(current_agg)
                             print(f"[room:{self.room_name}] VAD aggressiveness updated to {current_agg}")
@@ -641,6 +652,8 @@ class SessionRoom:
 
         WebRTC VAD supports 8/16/32/48kHz with 10/20/30ms frames.  We pass
         raw 48kHz frames directly — VAD internally downsamples to 8kHz.
+        A frame longer than one VAD window is checked window by window and
+        counts as speech if any window is.
         No energy fallback; failures are logged explicitly.
         """
         if not self._vad:
@@ -649,8 +662,10 @@ class SessionRoom:
         try:
             frame_samples = int(sample_rate * VAD_FRAME_MS / 1000)
             if len(samples) >= frame_samples:
-                chunk = samples[:frame_samples]
-                return self._vad.is_speech(chunk.tobytes(), sample_rate)
+                return any(
+                    self._vad.is_speech(samples[off:off + frame_samples].tobytes(), sample_rate)
+                    for off in range(0, len(samples) - frame_samples + 1, frame_samples)
+                )
             else:
                 print(f"[room:{self.room_name}] WARNING: frame too small for VAD "
                       f"({len(samples)} samples, need {frame_samples})")
@@ -667,13 +682,17 @@ class SessionRoom:
         all_audio = np.concatenate(self._audio_buffer)
         self._clear_audio_buffer()
 
-        # Resample from 48kHz to 16kHz for Whisper
+        # Resample from 48kHz to 16kHz for Whisper.  Polyphase FIR instead of
+        # FFT resampling — the utterance length is arbitrary (often not
+        # FFT-friendly) and can be minutes long.  The filter can overshoot
+        # slightly, so clip before narrowing back to int16.
         if LIVEKIT_INPUT_RATE != STT_SAMPLE_RATE:
-            from scipy import signal as scipy_signal
-            all_audio = scipy_signal.resample(
-                all_audio.astype(np.float64),  # float64 avoids int16 precision loss
-                int(len(all_audio) * STT_SAMPLE_RATE / LIVEKIT_INPUT_RATE),
-            ).astype(np.int16)
+            if scipy_signal is None:
+                raise RuntimeError("scipy is required to resample audio for Whisper")
+            all_audio = scipy_signal.resample_poly(
+                all_audio, _STT_RESAMPLE_UP, _STT_RESAMPLE_DOWN,
+            )
+            all_audio = np.clip(all_audio, -32768, 32767).astype(np.int16)
 
         duration_s = len(all_audio) / STT_SAMPLE_RATE
         print(f"[room:{self.room_name}] Sending {duration_s:.1f}s of audio to Whisper")
@@ -871,10 +890,21 @@ class SessionRoom:
         """Process TTS responses one at a time to prevent state conflicts."""
         while self._running:
             try:
-                text = await self._response_queue.get()
+                parts = [await self._response_queue.get()]
+                # Responses that queued up while the previous one was playing
+                # are spoken as one stream — one Kokoro request and no
+                # inter-response gap instead of a round-trip per response.
+                while True:
+                    try:
+                        parts.append(self._response_queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                # Sanitize each response on its own before joining, so an
+                # unclosed code fence in one can't swallow the next.
+                spoken = [t for t in map(sanitize_for_tts, parts) if t]
                 # Clear any stale cancel signal from the previous response
                 self._tts_cancel_event.clear()
-                await self._play_tts_response(text)
+                await self._play_tts_response("\n\n".join(spoken))
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -899,13 +929,17 @@ class SessionRoom:
             print(f"[room:{self.room_name}] cancel_tts drained {drained} queued response(s)")
 
     async def _play_tts_response(self, text: str):
-        """Stream-synthesize and play a single TTS response."""
+        """Stream-synthesize and play a single TTS response.
+
+        text has already been through sanitize_for_tts (per response, in
+        _response_worker).
+        """
         # tts_sanitize handles markdown/code/path stripping; outbound rules
         # cover anything else (acronym expansion, replacements, etc.). Order
         # is sanitize-then-rules so future outbound rules see clean prose.
         # When sanitize_for_tts is eventually folded into OUTBOUND_RULES this
         # collapses to a single apply_outbound call.
-        spoken_text = apply_outbound(sanitize_for_tts(text))
+        spoken_text = apply_outbound(text)
         if not spoken_text:
             print(f"[room:{self.room_name}] TTS skipped: sanitized text is empty")
             return
@@ -1021,21 +1055,22 @@ class SessionRoom:
 
         frame_size = LIVEKIT_SAMPLE_RATE // 100  # 10ms frames
 
-        # Pre-allocate a reusable padding buffer to avoid per-iteration np.pad allocations
-        pad_buf = None
+        # One frame is reused for every 10ms of TTS — capture_frame has
+        # handed the samples to LiveKit by the time it returns, so the
+        # buffer can be overwritten for the next frame.
+        if self._tts_frame is None:
+            self._tts_frame = rtc.AudioFrame.create(LIVEKIT_SAMPLE_RATE, NUM_CHANNELS, frame_size)
+            self._tts_frame_view = np.frombuffer(self._tts_frame.data, dtype=np.int16)
+        frame = self._tts_frame
+        audio_data = self._tts_frame_view
 
         for i in range(0, total_samples, frame_size):
             chunk = samples[i:i + frame_size]
-            if len(chunk) < frame_size:
-                if pad_buf is None:
-                    pad_buf = np.zeros(frame_size, dtype=np.int16)
-                pad_buf[:len(chunk)] = chunk
-                pad_buf[len(chunk):] = 0
-                chunk = pad_buf
-
-            frame = rtc.AudioFrame.create(LIVEKIT_SAMPLE_RATE, NUM_CHANNELS, frame_size)
-            audio_data = np.frombuffer(frame.data, dtype=np.int16)
-            np.copyto(audio_data, chunk)
+            n = len(chunk)
+            audio_data[:n] = chunk
+            if n < frame_size:
+                # Short final chunk — zero-pad the rest of the frame in place
+                audio_data[n:] = 0
             await self.audio_source.capture_frame(frame)
 
         return total_samples
@@ -1141,25 +1176,21 @@ class RelayAgent:
             await self.remove_session(session_id)
 
 
+# RIFF/WAVE header for 16-bit mono PCM: only the sizes and rate vary.
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+
 def _to_wav(samples: np.ndarray, sample_rate: int) -> bytes:
     """Convert numpy int16 samples to WAV bytes.
 
-    Pre-allocates the output buffer to avoid intermediate copies.
+    Joins the packed header with a view of the sample buffer, so the PCM
+    data is copied exactly once (into the returned bytes).
     """
-    num_samples = len(samples)
-    data_size = num_samples * 2
-    # Pre-allocate the exact output size: 44-byte WAV header + raw PCM data
-    buf = bytearray(44 + data_size)
-
-    # WAV header (44 bytes)
-    struct.pack_into("<4sI4s", buf, 0, b"RIFF", 36 + data_size, b"WAVE")
-    struct.pack_into("<4sIHHIIHH", buf, 12,
-                     b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
-    struct.pack_into("<4sI", buf, 36, b"data", data_size)
-
-    # Copy PCM data directly into the buffer
-    raw = samples.tobytes()
-    buf[44:] = raw
-    del raw  # Release the temporary bytes object
-
-    return bytes(buf)
+    data_size = len(samples) * 2
+    header = _WAV_HEADER.pack(
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", data_size,
+    )
+    pcm = memoryview(np.ascontiguousarray(samples, dtype=np.int16)).cast("B")
+    return b"".join((header, pcm))
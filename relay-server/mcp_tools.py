@@ -11,9 +11,11 @@ no session parameters needed.
 """
 
 import asyncio
+import functools
 import hashlib
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Awaitable, Callable, Optional
 from urllib.parse import urlparse, unquote
 
 from fastmcp import FastMCP, Context
@@ -35,8 +37,13 @@ def _bg(coro) -> asyncio.Task:
 mcp = FastMCP("voice-multiplexer")
 
 
+@functools.lru_cache(maxsize=256)
 def _make_session_id(cwd: str) -> str:
-    """Generate a deterministic session ID from a working directory path."""
+    """Generate a deterministic session ID from a working directory path.
+
+    Memoized — the same handful of cwds are re-hashed on every
+    re-registration and on each periodic daemon resync.
+    """
     return hashlib.sha256(cwd.encode()).hexdigest()[:12]
 
 
@@ -53,6 +60,23 @@ _connection_map: dict[str, tuple[str, str]] = {}
 _ACTIVITY_MIN_INTERVAL = 3.0  # seconds
 _last_activity: dict[str, tuple[float, str]] = {}
 
+# --- relay_image / relay_file lookup tables (extension → type) ---
+_IMAGE_MIME_TYPES = {
+    ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
+    ".png": "image/png", ".gif": "image/gif",
+    ".webp": "image/webp", ".svg": "image/svg+xml",
+    ".bmp": "image/bmp", ".ico": "image/x-icon",
+}
+_LANGUAGE_MAP = {
+    ".py": "python", ".js": "javascript", ".ts": "typescript",
+    ".tsx": "typescript", ".jsx": "javascript", ".json": "json",
+    ".md": "markdown", ".yaml": "yaml", ".yml": "yaml",
+    ".xml": "xml", ".html": "html", ".css": "css",
+    ".java": "java", ".go": "go", ".rs": "rust",
+    ".rb": "ruby", ".php": "php", ".sh": "bash",
+    ".c": "c", ".cpp": "cpp", ".sql": "sql",
+}
+
 
 async def _resolve_session(ctx: Context) -> tuple[Optional[str], Optional[str]]:
     """Get the relay session_id for this SSE connection.
@@ -65,7 +89,7 @@ async def _resolve_session(ctx: Context) -> tuple[Optional[str], Optional[str]]:
     if entry:
         session_id, _cwd = entry
         # Fast path — verify session still exists in registry.
-        registry = _app["registry"]
+        registry = _app.registry
         if await registry.get(session_id):
             return session_id, None
         # Session was pruned — clear stale mapping and fall through to re-registration.
@@ -79,7 +103,7 @@ async def _resolve_session(ctx: Context) -> tuple[Optional[str], Optional[str]]:
     session_id = _make_session_id(cwd)
 
     # Register the session in the relay registry
-    registry = _app["registry"]
+    registry = _app.registry
     if not registry:
         return None, "Registry unavailable."
 
@@ -96,7 +120,7 @@ async def _resolve_session(ctx: Context) -> tuple[Optional[str], Optional[str]]:
     _connection_map[mcp_sid] = (session_id, cwd)
 
     # Manage LiveKit room
-    agent = _app["get_agent"]()
+    agent = _app.get_agent()
     if agent:
         if is_reconnect:
             try:
@@ -108,8 +132,8 @@ async def _resolve_session(ctx: Context) -> tuple[Optional[str], Optional[str]]:
         except Exception as e:
             print(f"[mcp] Failed to create room for session: {e}")
 
-    if _app["broadcast_sessions"]:
-        await _app["broadcast_sessions"]()
+    if _app.broadcast_sessions:
+        await _app.broadcast_sessions()
 
     return session_id, None
 
@@ -127,24 +151,28 @@ async def _detect_cwd(ctx: Context) -> Optional[str]:
 
 # --- App state (set by server.py at startup) ---
 
-_app = {
-    "registry": None,
-    "get_agent": None,
-    "notify_transcript": None,
-    "notify_status": None,
-    "broadcast_sessions": None,
-    "mark_tts": None,
-}
+@dataclass(slots=True)
+class _AppState:
+    """Relay server hooks, read by every tool call."""
+    registry: Any = None
+    get_agent: Optional[Callable[[], Any]] = None
+    notify_transcript: Optional[Callable[..., Awaitable[None]]] = None
+    notify_status: Optional[Callable[..., Awaitable[None]]] = None
+    broadcast_sessions: Optional[Callable[[], Awaitable[None]]] = None
+    mark_tts: Optional[Callable[[str, str], None]] = None
+
+
+_app = _AppState()
 
 
 def init(registry, get_agent, notify_transcript, notify_status, broadcast_sessions, mark_tts=None):
     """Initialize MCP tools with relay server dependencies."""
-    _app["registry"] = registry
-    _app["get_agent"] = get_agent
-    _app["notify_transcript"] = notify_transcript
-    _app["notify_status"] = notify_status
-    _app["broadcast_sessions"] = broadcast_sessions
-    _app["mark_tts"] = mark_tts
+    _app.registry = registry
+    _app.get_agent = get_agent
+    _app.notify_transcript = notify_transcript
+    _app.notify_status = notify_status
+    _app.broadcast_sessions = broadcast_sessions
+    _app.mark_tts = mark_tts
 
 
 @mcp.tool()
@@ -159,7 +187,7 @@ async def relay_notify(ctx: Context, message: str, source: str = "") -> str:
     if err:
         return err
 
-    registry = _app["registry"]
+    registry = _app.registry
     session = await registry.get(session_id)
     if not session:
         return "Session not found."
@@ -170,8 +198,8 @@ async def relay_notify(ctx: Context, message: str, source: str = "") -> str:
     # Broadcast to web transcript so the notification is visible in real time.
     # The parent session sees completion via its own tool results; this tool
     # only surfaces the notice to the remote user.
-    if _app["notify_transcript"]:
-        await _app["notify_transcript"](session_id, "system", full_message)
+    if _app.notify_transcript:
+        await _app.notify_transcript(session_id, "system", full_message)
 
     return "Sent."
 
@@ -189,7 +217,7 @@ async def relay_activity(ctx: Context, activity: str, source: str = "") -> str:
         return err
 
     # Keep session alive by touching the heartbeat on every tool call
-    registry = _app["registry"]
+    registry = _app.registry
     if registry:
         await registry.heartbeat(session_id)
 
@@ -205,7 +233,7 @@ async def relay_activity(ctx: Context, activity: str, source: str = "") -> str:
             return "OK"
     _last_activity[session_id] = (now, labeled)
 
-    agent = _app["get_agent"]()
+    agent = _app.get_agent()
     if agent and labeled:
         _bg(agent.handle_status_update(session_id, labeled))
 
@@ -224,7 +252,7 @@ async def relay_respond(ctx: Context, text: str) -> str:
         return err
 
     # Keep session alive by touching the heartbeat on every tool call
-    registry = _app["registry"]
+    registry = _app.registry
     if registry:
         await registry.heartbeat(session_id)
 
@@ -233,16 +261,16 @@ async def relay_respond(ctx: Context, text: str) -> str:
 
     # Prime TTS dedup so the Stop hook's /tts call (which re-extracts the
     # same final text from the transcript JSONL) is skipped.
-    if _app.get("mark_tts"):
-        _app["mark_tts"](session_id, text)
+    if _app.mark_tts:
+        _app.mark_tts(session_id, text)
 
-    agent = _app["get_agent"]()
+    agent = _app.get_agent()
     if agent:
         _bg(agent.handle_claude_response(session_id, text))
 
     # Broadcast transcript
-    if _app["notify_transcript"]:
-        await _app["notify_transcript"](session_id, "claude", text)
+    if _app.notify_transcript:
+        await _app.notify_transcript(session_id, "claude", text)
 
     return "OK"
 
@@ -261,15 +289,15 @@ async def relay_code_block(ctx: Context, code: str, filename: str = "", language
         return err
 
     # Keep session alive by touching the heartbeat on every tool call
-    registry = _app["registry"]
+    registry = _app.registry
     if registry:
         await registry.heartbeat(session_id)
 
     if not code:
         return "No code provided."
 
-    if _app["notify_transcript"]:
-        await _app["notify_transcript"](
+    if _app.notify_transcript:
+        await _app.notify_transcript(
             session_id, "code", code,
             filename=filename,
             language=language,
@@ -285,8 +313,8 @@ async def relay_disconnect(ctx: Context) -> str:
     if err:
         return err
 
-    registry = _app["registry"]
-    agent = _app["get_agent"]()
+    registry = _app.registry
+    agent = _app.get_agent()
 
     if agent:
         try:
@@ -300,8 +328,8 @@ async def relay_disconnect(ctx: Context) -> str:
     mcp_sid = ctx.session_id
     _connection_map.pop(mcp_sid, None)
 
-    if _app["broadcast_sessions"]:
-        await _app["broadcast_sessions"]()
+    if _app.broadcast_sessions:
+        await _app.broadcast_sessions()
 
     return "Disconnected."
 
@@ -309,7 +337,7 @@ async def relay_disconnect(ctx: Context) -> str:
 @mcp.tool()
 async def relay_status(ctx: Context) -> str:
     """Show relay connection status."""
-    registry = _app["registry"]
+    registry = _app.registry
     if not registry:
         return "Not initialized."
 
@@ -341,7 +369,7 @@ async def relay_image(ctx: Context, file_path: str) -> str:
         return err
 
     # Keep session alive by touching the heartbeat on every tool call
-    registry = _app["registry"]
+    registry = _app.registry
     if registry:
         await registry.heartbeat(session_id)
 
@@ -357,27 +385,23 @@ async def relay_image(ctx: Context, file_path: str) -> str:
 
     # Detect MIME type from extension
     suffix = p.suffix.lower()
-    mime_map = {
-        ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
-        ".png": "image/png", ".gif": "image/gif",
-        ".webp": "image/webp", ".svg": "image/svg+xml",
-        ".bmp": "image/bmp", ".ico": "image/x-icon",
-    }
-    mime_type = mime_map.get(suffix)
+    mime_type = _IMAGE_MIME_TYPES.get(suffix)
     if not mime_type:
         return f"Unsupported format: {suffix}"
 
-    # Read and base64 encode
+    # Read and base64 encode off the event loop — images can be several MB
+    # and every other MCP session and web client shares this loop.
     try:
         import base64
-        data = p.read_bytes()
-        b64 = base64.b64encode(data).decode("ascii")
+        b64 = await asyncio.to_thread(
+            lambda: base64.b64encode(p.read_bytes()).decode("ascii")
+        )
     except Exception as e:
         return f"Failed to read image: {e}"
 
     # Send to transcript as image type (not buffered server-side to avoid memory bloat)
-    if _app["notify_transcript"]:
-        await _app["notify_transcript"](
+    if _app.notify_transcript:
+        await _app.notify_transcript(
             session_id, "image", b64,
             filename=p.name,
             mime_type=mime_type,
@@ -399,7 +423,7 @@ async def relay_file(ctx: Context, file_path: str, read_aloud: bool = False) ->
         return err
 
     # Keep session alive by touching the heartbeat on every tool call
-    registry = _app["registry"]
+    registry = _app.registry
     if registry:
         await registry.heartbeat(session_id)
 
@@ -413,34 +437,24 @@ async def relay_file(ctx: Context, file_path: str, read_aloud: bool = False) ->
     except Exception as e:
         return f"Invalid path: {e}"
 
-    # Read file
+    # Read file off the event loop so a large file doesn't stall other sessions
     try:
-        content = p.read_text(encoding="utf-8", errors="replace")
+        content = await asyncio.to_thread(p.read_text, encoding="utf-8", errors="replace")
     except Exception as e:
         return f"Failed to read file: {e}"
 
     # Detect language for syntax highlighting
-    suffix = p.suffix.lower()
-    language_map = {
-        ".py": "python", ".js": "javascript", ".ts": "typescript",
-        ".tsx": "typescript", ".jsx": "javascript", ".json": "json",
-        ".md": "markdown", ".yaml": "yaml", ".yml": "yaml",
-        ".xml": "xml", ".html": "html", ".css": "css",
-        ".java": "java", ".go": "go", ".rs": "rust",
-        ".rb": "ruby", ".php": "php", ".sh": "bash",
-        ".c": "c", ".cpp": "cpp", ".sql": "sql",
-    }
-    language = language_map.get(suffix, "")
+    language = _LANGUAGE_MAP.get(p.suffix.lower(), "")
 
     # Read aloud via TTS if requested
     if read_aloud:
-        agent = _app["get_agent"]()
+        agent = _app.get_agent()
         if agent:
             _bg(agent.handle_claude_response(session_id, content))
 
     # Send to transcript
-    if _app["notify_transcript"]:
-        await _app["notify_transcript"](
+    if _app.notify_transcript:
+        await _app.notify_transcript(
             session_id, "file", content,
             filename=p.name,
             language=language,
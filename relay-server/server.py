@@ -10,7 +10,6 @@ Bridges web clients (phone/browser) with Claude Code sessions via:
 
 import asyncio
 import gc
-import hashlib
 import json
 import os
 import resource
@@ -20,6 +19,30 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional
 
+# orjson is optional — every web-client frame (transcripts, relayed files
+# and code blocks, session lists) is serialized here, and relayed files can
+# be hundreds of KB.  The browser expects text frames, so decode back to str.
+# Both loaders accept bytes, so daemon IPC replies skip the decode step.
+# orjson rejects lone surrogates ("\ud800") that stdlib json accepts, so
+# both helpers fall back to json rather than dropping the connection.
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            return json.dumps(obj)
+
+    def _json_loads(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
 # Raise file descriptor limit — launchd defaults to 256 which is too low
 # for a server managing multiple SSE connections and LiveKit rooms.
 try:
@@ -206,6 +229,12 @@ def _spawn_background(coro) -> asyncio.Task:
     task.add_done_callback(_done_callback)
     return task
 
+
+# Keepalive frame sent to idle web clients — constant, so serialize once.
+_WS_PING_FRAME = _json_dumps({"type": "ping"})
+# The client's reply, exactly as JSON.stringify({type: "pong"}) emits it.
+_WS_PONG_FRAME = '{"type":"pong"}'
+
 # Transcript buffer per session (keyed by session_id)
 # Holds the last N entries so reconnecting clients can catch up.
 MAX_TRANSCRIPT_BUFFER = 50
@@ -231,7 +260,7 @@ def _is_daemon_request(request: Request) -> bool:
     """Check if request is from the vmux daemon (X-Daemon-Secret header)."""
     if not DAEMON_SECRET:
         return False
-    return request.headers.get("X-Daemon-Secret") == DAEMON_SECRET
+    return auth.compare_secret(request.headers.get("X-Daemon-Secret"), DAEMON_SECRET)
 
 
 def _get_device(request: Request) -> Optional[dict]:
@@ -314,7 +343,7 @@ async def _notify_client_status(session_id: str, state: str, activity: Optional[
             payload["tool_use_id"] = tool_use_id
         if tool_name:
             payload["tool_name"] = tool_name
-        msg = json.dumps(payload)
+        msg = _json_dumps(payload)
         for client_id in list(session.connected_clients):
             client_ws = _clients.get(client_id)
             if client_ws:
@@ -333,7 +362,7 @@ async def _notify_client_event(session_id: str, payload: dict):
     session = await registry.get(session_id)
     if not session or not session.connected_clients:
         return
-    msg = json.dumps(payload)
+    msg = _json_dumps(payload)
     for client_id in list(session.connected_clients):
         client_ws = _clients.get(client_id)
         if client_ws:
@@ -380,7 +409,7 @@ async def _notify_client_transcript(session_id: str, speaker: str, text: str, **
         if len(buf) > MAX_TRANSCRIPT_BUFFER:
             _transcript_buffers[session_id] = buf[-MAX_TRANSCRIPT_BUFFER:]
 
-    msg = json.dumps(entry)
+    msg = _json_dumps(entry)
     if extra.get("agent_id") or extra.get("kind") or speaker == "activity":
         print(f"[DEBUG-bcast] speaker={speaker} agent_id={extra.get('agent_id')!r} kind={extra.get('kind')!r} text={text[:80]!r}", flush=True)
     for client_ws in list(_clients.values()):
@@ -421,7 +450,7 @@ async def _periodic_session_resync():
             ]
             for s in sessions:
                 cwd = s["cwd"]
-                session_id = s.get("relay_session_id") or hashlib.sha256(cwd.encode()).hexdigest()[:12]
+                session_id = s.get("relay_session_id") or mcp_tools._make_session_id(cwd)
                 existing = await registry.get(session_id)
                 if existing and existing.cwd == cwd:
                     # Already known — just refresh heartbeat.
@@ -484,7 +513,7 @@ async def _sync_sessions_from_daemon():
         registered = 0
         for s in sessions:
             cwd = s["cwd"]
-            session_id = s.get("relay_session_id") or hashlib.sha256(cwd.encode()).hexdigest()[:12]
+            session_id = s.get("relay_session_id") or mcp_tools._make_session_id(cwd)
             name = s.get("session_name") or Path(cwd).name
             dir_name = Path(cwd).name
             try:
@@ -563,8 +592,15 @@ async def lifespan(app: FastAPI):
     _spawn_background(_periodic_session_resync())
 
     yield
+    # Wait for the background loops to actually unwind before tearing down
+    # the resources they use (agent, metadata store, HTTP client).
     _fd_monitor_task.cancel()
     _mem_cleanup_task.cancel()
+    await asyncio.gather(_fd_monitor_task, _mem_cleanup_task, return_exceptions=True)
+    try:
+        auth.flush_last_seen()
+    except Exception as e:
+        print(f"[server] Failed to flush device last_seen: {e}")
     if _agent:
         await _agent.stop()
     await metadata_store.close()
@@ -610,7 +646,7 @@ async def _memory_cleanup_loop():
     Runs every 2 minutes and:
     - Removes transcript buffers for sessions that no longer exist
     - Cleans up stale MCP connection mappings
-    - Prunes stale auth rate-limit entries
+    - Prunes stale auth rate-limit entries and flushes device last_seen times
     - Forces a full garbage collection (all generations) to reclaim circular refs
     - Logs RSS so memory growth is visible in logs
     """
@@ -666,8 +702,9 @@ async def _memory_cleanup_loop():
             if stale_mcp > 0:
                 print(f"[mem-cleanup] Removed {stale_mcp} stale MCP connection mapping(s)")
 
-            # Prune empty auth rate-limit entries
+            # Prune empty auth rate-limit entries and persist device last_seen
             auth.cleanup_stale_rate_limits()
+            auth.flush_last_seen()
 
             # Clean up stale LiveKit rooms that don't correspond to active sessions
             if _agent:
@@ -1069,7 +1106,7 @@ async def _daemon_ipc(cmd: dict) -> dict:
         writer.write((json.dumps(cmd) + "\n").encode())
         await writer.drain()
         line = await asyncio.wait_for(reader.readline(), timeout=10.0)
-        return json.loads(line.decode().strip())
+        return _json_loads(line)
     except FileNotFoundError:
         return {"ok": False, "error": "vmuxd is not running"}
     except Exception as e:
@@ -1175,7 +1212,7 @@ async def interrupt_session(session_id: str, request: Request):
         # transitions to idle.
         if _agent:
             _spawn_background(_agent.handle_claude_listening(session_id))
-        msg = json.dumps({
+        msg = _json_dumps({
             "type": "turn-complete",
             "session_id": session_id,
             "ts": time.time(),
@@ -1325,7 +1362,7 @@ async def turn_complete_session(session_id: str, request: Request):
         await _agent.handle_claude_listening(session_id)
 
     # Also broadcast a turn-complete event for the web client.
-    msg = json.dumps({
+    msg = _json_dumps({
         "type": "turn-complete",
         "session_id": session_id,
         "ts": time.time(),
@@ -1399,7 +1436,7 @@ async def tool_result_from_hook(session_id: str, request: Request):
     if not session:
         return JSONResponse({"error": "Session not found"}, status_code=404)
 
-    msg = json.dumps({
+    msg = _json_dumps({
         "type": "tool_result",
         "session_id": session_id,
         "tool_use_id": tool_use_id,
@@ -1472,7 +1509,7 @@ def _task_list_snapshot(session_id: str) -> list[dict]:
 
 async def _broadcast_task_list(session_id: str) -> None:
     """Broadcast the current task list for a session to all WS clients."""
-    msg = json.dumps({
+    msg = _json_dumps({
         "type": "task_list",
         "session_id": session_id,
         "tasks": _task_list_snapshot(session_id),
@@ -1588,7 +1625,7 @@ def _pr_list_snapshot(session_id: str) -> list[dict]:
 
 async def _broadcast_pr_list(session_id: str) -> None:
     """Broadcast the current PR list for a session to all WS clients."""
-    msg = json.dumps({
+    msg = _json_dumps({
         "type": "pr_list",
         "session_id": session_id,
         "prs": _pr_list_snapshot(session_id),
@@ -1668,7 +1705,7 @@ async def permission_request_from_hook(session_id: str, request: Request):
             "summary": summary,
         },
     }
-    msg = json.dumps(entry)
+    msg = _json_dumps(entry)
     for client_ws in list(_clients.values()):
         try:
             await client_ws.send_text(msg)
@@ -1716,7 +1753,7 @@ async def question_from_hook(session_id: str, request: Request):
             "question_count": int(body.get("question_count") or 1),
         },
     }
-    msg = json.dumps(entry)
+    msg = _json_dumps(entry)
     for client_ws in list(_clients.values()):
         try:
             await client_ws.send_text(msg)
@@ -1936,7 +1973,7 @@ async def reconnect_session_endpoint(request: Request):
 
 async def _broadcast_metadata_update(metadata: dict):
     """Broadcast a session_metadata_updated message to all connected web clients."""
-    msg = json.dumps({"type": "session_metadata_updated", "metadata": metadata})
+    msg = _json_dumps({"type": "session_metadata_updated", "metadata": metadata})
     for client_ws in list(_clients.values()):
         try:
             await client_ws.send_text(msg)
@@ -2053,7 +2090,7 @@ async def client_ws(ws: WebSocket):
     try:
         # Send current session list on connect
         sessions = await registry.list_sessions()
-        await ws.send_text(json.dumps({"type": "sessions", "sessions": sessions}))
+        await ws.send_text(_json_dumps({"type": "sessions", "sessions": sessions}))
 
         while True:
             try:
@@ -2062,12 +2099,15 @@ async def client_ws(ws: WebSocket):
                 # No message for 30s — send keepalive ping to prevent
                 # NAT/mobile idle timeout from silently killing connection
                 try:
-                    await ws.send_text(json.dumps({"type": "ping"}))
+                    await ws.send_text(_WS_PING_FRAME)
                 except Exception:
                     break  # Connection dead
                 continue
 
-            data = json.loads(raw)
+            if raw == _WS_PONG_FRAME:
+                continue  # Keepalive response — skip the JSON parse
+
+            data = _json_loads(raw)
             msg_type = data.get("type")
 
             if msg_type == "pong":
@@ -2089,11 +2129,11 @@ async def client_ws(ws: WebSocket):
                 }
                 if session_data:
                     msg["session_name"] = session_data.name
-                await ws.send_text(json.dumps(msg))
+                await ws.send_text(_json_dumps(msg))
                 # Send current agent status so new clients see the real state
                 if success and _agent:
                     status = _agent.get_current_status(session_id)
-                    await ws.send_text(json.dumps({
+                    await ws.send_text(_json_dumps({
                         "type": "agent_status",
                         "state": status.get("state", "idle"),
                         "activity": status.get("activity"),
@@ -2103,7 +2143,7 @@ async def client_ws(ws: WebSocket):
                 # Send current task list snapshot so reconnecting clients
                 # see what Claude is currently working on.
                 if success and _task_lists.get(session_id):
-                    await ws.send_text(json.dumps({
+                    await ws.send_text(_json_dumps({
                         "type": "task_list",
                         "session_id": session_id,
                         "tasks": _task_list_snapshot(session_id),
@@ -2113,7 +2153,7 @@ async def client_ws(ws: WebSocket):
                 # Send current PR list snapshot so reconnecting clients see
                 # PRs opened earlier in the session.
                 if success and _pr_lists.get(session_id):
-                    await ws.send_text(json.dumps({
+                    await ws.send_text(_json_dumps({
                         "type": "pr_list",
                         "session_id": session_id,
                         "prs": _pr_list_snapshot(session_id),
@@ -2124,7 +2164,7 @@ async def client_ws(ws: WebSocket):
                 if success and session_id in _transcript_buffers:
                     buf = _transcript_buffers[session_id]
                     if buf:
-                        await ws.send_text(json.dumps({
+                        await ws.send_text(_json_dumps({
                             "type": "transcript_sync",
                             "session_id": session_id,
                             "session_name": session_data.name if session_data else session_id,
@@ -2141,7 +2181,7 @@ async def client_ws(ws: WebSocket):
                         # Check if session is stale (Claude Code disconnected)
                         if session.is_stale:
                             # Session has gone stale — Claude Code must reconnect
-                            await ws.send_text(json.dumps({
+                            await ws.send_text(_json_dumps({
                                 "type": "session_disconnected",
                                 "session_id": connected_session_id,
                                 "reason": "Claude Code session idle timeout",
@@ -2165,7 +2205,7 @@ async def client_ws(ws: WebSocket):
                                 await _notify_client_transcript(connected_session_id, "user", text)
                             except Exception as e:
                                 print(f"Failed to inject text for session {connected_session_id}: {e}")
-                                await ws.send_text(json.dumps({
+                                await ws.send_text(_json_dumps({
                                     "type": "session_disconnected",
                                     "session_id": connected_session_id,
                                     "reason": "Failed to send message",
@@ -2262,7 +2302,7 @@ async def client_ws(ws: WebSocket):
                             "lines": 50,
                         })
                         if capture.get("ok"):
-                            await ws.send_text(json.dumps({
+                            await ws.send_text(_json_dumps({
                                 "type": "terminal_snapshot",
                                 "session_id": connected_session_id,
                                 "content": capture["output"],
@@ -2297,14 +2337,14 @@ async def client_ws(ws: WebSocket):
                         "lines": lines,
                     })
                     if result.get("ok"):
-                        await ws.send_text(json.dumps({
+                        await ws.send_text(_json_dumps({
                             "type": "terminal_snapshot",
                             "session_id": connected_session_id,
                             "content": result["output"],
                             "timestamp": time.time(),
                         }))
                     else:
-                        await ws.send_text(json.dumps({
+                        await ws.send_text(_json_dumps({
                             "type": "terminal_snapshot",
                             "session_id": connected_session_id,
                             "content": None,
@@ -2336,7 +2376,7 @@ async def client_ws(ws: WebSocket):
                                 content = result.get("content", "")
                                 if content and content != prev_content:
                                     prev_content = content
-                                    await target_ws.send_text(json.dumps({
+                                    await target_ws.send_text(_json_dumps({
                                         "type": "terminal_data",
                                         "data": content,
                                     }))
@@ -2425,7 +2465,7 @@ async def _broadcast_sessions():
                     s["daemon_managed"] = True
     except Exception:
         pass
-    msg = json.dumps({"type": "sessions", "sessions": sessions})
+    msg = _json_dumps({"type": "sessions", "sessions": sessions})
     for client_ws in list(_clients.values()):
         try:
             await client_ws.send_text(msg)
@@ -2574,4 +2614,7 @@ app = _TopLevelASGIGuard(app)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host=RELAY_HOST, port=RELAY_PORT)
+    # loop="auto" picks uvloop when it's installed (it ships in the relay's
+    # dependency set) — every WebSocket, SSE/MCP and HTTP socket op then goes
+    # through libuv instead of the stdlib selector loop.
+    uvicorn.run(app, host=RELAY_HOST, port=RELAY_PORT, loop="auto")
@@ -507,7 +507,9 @@ log "vmux CLI installed at $VMUX_LINK"
 UV_PATH=$(command -v uv || echo "$HOME/.local/bin/uv")
 VMUXD_PATH="$DAEMON_INSTALL_DIR/vmuxd.py"
 VMUXD_WRAPPER="$DAEMON_INSTALL_DIR/vmuxd"
-LOG_PATH="$DATA_DIR/logs/daemon.log"
+# Service-manager stdout gets its own file: vmuxd rotates daemon.log itself,
+# and an fd held open by launchd/systemd would follow the renamed file.
+LOG_PATH="$DATA_DIR/logs/daemon-stdout.log"
 LOG_ERR_PATH="$DATA_DIR/logs/daemon-error.log"
 PLUGIN_DIR="$PROJECT_DIR"
 
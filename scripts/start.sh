@@ -205,6 +205,7 @@ cd "$PROJECT_DIR/relay-server"
 uv run \
     --python 3.12 \
     --with "fastapi>=0.110" --with "uvicorn>=0.27" \
+    --with "uvloop>=0.19" --with "orjson>=3.9" \
     --with "websockets>=12.0" --with "httpx>=0.27" \
     --with "python-dotenv>=1.0" --with "livekit-api>=0.7" \
     --with "livekit>=1.0" --with "numpy>=1.24" \
@@ -751,11 +751,14 @@ export function useRelay(authenticated: boolean = true) {
       }));
       // Don't reconnect on auth failure (4001)
       if (event.code === 4001) return;
-      // Exponential backoff reconnect
-      const delay = Math.min(
+      // Exponential backoff reconnect with jitter — every open tab drops at
+      // once when the relay restarts, so spread the retries out instead of
+      // having them all land on the fresh server in the same instant.
+      const ceiling = Math.min(
         BASE_RECONNECT_DELAY * 2 ** reconnectAttempt.current,
         MAX_RECONNECT_DELAY,
       );
+      const delay = ceiling / 2 + Math.random() * (ceiling / 2);
       reconnectAttempt.current++;
       reconnectTimer.current = setTimeout(connect, delay);
     };